@@ -1,6 +1,9 @@
 import json
+import logging
 import os
-from typing import Optional, Dict, Any, List, Callable
+from functools import partial
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Callable, Set, Tuple
 
 from fabric.hyprland.service import HyprlandEvent
 from fabric.hyprland.widgets import HyprlandLanguage as Language
@@ -23,11 +26,14 @@ from modules.metrics import Battery, MetricsSmall, NetworkApplet
 from modules.systemprofiles import Systemprofiles
 from modules.systemtray import SystemTray
 from modules.weather import Weather
+from utils.functions import write_file_atomic
 from widgets.wayland import WaylandWindow as Window
 
+logger = logging.getLogger(__name__)
 
 # Константы
-CHINESE_NUMERALS = ["一", "二", "三", "四", "五", "六", "七", "八", "九", "〇"]
+CHINESE_NUMERALS = ("一", "二", "三", "四", "五", "六", "七", "八", "九", "〇")
+_CHINESE_LABEL = dict(enumerate(CHINESE_NUMERALS))
 
 TOOLTIP_APPS = f"""Launcher
 
@@ -48,7 +54,19 @@ TOOLTIP_POWER = "Power Menu"
 TOOLTIP_TOOLS = "Toolbox"
 TOOLTIP_OVERVIEW = "Overview"
 
-THEME_CLASSES = ["pills", "dense", "edge", "edgecenter"]
+FOCUS_NOTCH_COMMAND = "hyprctl dispatch focuswindow class:notch"
+
+_THEME_MAP_DEFAULT = MappingProxyType({"Pills": "pills", "Dense": "dense", "Edge": "edge"})
+_THEME_MAP_V_CENTERED = MappingProxyType({"Pills": "pills", "Dense": "dense", "Edge": "edgecenter"})
+_POSITION_CLASS = MappingProxyType({
+    "Top": "top",
+    "Bottom": "bottom",
+    "Left": "left",
+    "Right": "right",
+})
+
+# Задержка (мс) для объединения нескольких переключений в одну запись конфига
+CONFIG_SAVE_DELAY = 250
 
 
 class Bar(Window):
@@ -61,6 +79,14 @@ class Bar(Window):
         self.dock_instance: Optional[Dock] = None
         self.integrated_dock_widget: Optional[Box] = None
         self.hidden = False
+        self._cursor_cache: Dict[Gdk.Display, Gdk.Cursor] = {}
+        self._current_theme_class: Optional[str] = None
+        self._last_lang: Optional[str] = None
+        self._config_path = os.path.expanduser(f"~/.config/{data.APP_NAME}/config/config.json")
+        self._config: Optional[Dict[str, Any]] = None
+        self._config_mtime: Optional[float] = None
+        self._config_dirty: Set[str] = set()
+        self._config_flush_pending = False
 
         super().__init__(
             name="bar",
@@ -86,26 +112,30 @@ class Bar(Window):
 
     def _setup_positioning(self):
         """Настроить позиционирование и отступы панели"""
+        centered = data.CENTERED_BAR
+        position = data.BAR_POSITION
+        is_edge = data.BAR_THEME == "Edge"
+
         anchor_map = {
             "Top": "left top right",
             "Bottom": "left bottom right",
-            "Left": "left" if data.CENTERED_BAR else "left top bottom",
-            "Right": "right" if data.CENTERED_BAR else "top right bottom",
+            "Left": "left" if centered else "left top bottom",
+            "Right": "right" if centered else "top right bottom",
         }
-        self.anchor_var = anchor_map.get(data.BAR_POSITION, "left top right")
+        self.anchor_var = anchor_map.get(position, "left top right")
 
         # Определение отступов
         if data.VERTICAL:
             self.margin_var = (
-                "-8px -8px -8px -8px" if data.BAR_THEME == "Edge"
+                "-8px -8px -8px -8px" if is_edge
                 else "-4px -8px -4px -4px"
             )
         else:
-            if data.BAR_THEME == "Edge":
+            if is_edge:
                 self.margin_var = "-8px -8px -8px -8px"
             else:
                 self.margin_var = (
-                    "-8px -4px -4px -4px" if data.BAR_POSITION == "Bottom"
+                    "-8px -4px -4px -4px" if position == "Bottom"
                     else "-4px -4px -8px -4px"
                 )
 
@@ -121,30 +151,26 @@ class Bar(Window):
 
     def _create_workspace_buttons(self, workspace_range: range, show_number: bool = False) -> List[WorkspaceButton]:
         """Создать кнопки для рабочих столов"""
-        buttons = []
-        for i in workspace_range:
-            label = None
-            if show_number:
-                workspace_index = i - workspace_range.start
-                label = (
-                    CHINESE_NUMERALS[workspace_index]
-                    if data.BAR_WORKSPACE_USE_CHINESE_NUMERALS
-                    and 0 <= workspace_index < len(CHINESE_NUMERALS)
-                    else str(i)
-                )
+        use_chinese = show_number and data.BAR_WORKSPACE_USE_CHINESE_NUMERALS
+        style = ("vertical",) if data.VERTICAL else None
+        start = workspace_range.start
 
-            button = WorkspaceButton(
+        return [
+            WorkspaceButton(
                 h_expand=False,
                 v_expand=False,
                 h_align="center",
                 v_align="center",
                 id=i,
-                label=label,
-                style_classes=["vertical"] if data.VERTICAL else None,
+                label=(
+                    _CHINESE_LABEL.get(i - start, str(i)) if use_chinese
+                    else str(i) if show_number
+                    else None
+                ),
+                style_classes=style,
             )
-            buttons.append(button)
-
-        return buttons
+            for i in workspace_range
+        ]
 
     def _init_workspaces(self):
         """Инициализировать виджеты рабочих столов"""
@@ -153,6 +179,7 @@ class Bar(Window):
             None if data.BAR_HIDE_SPECIAL_WORKSPACE
             else Workspaces.default_buttons_factory
         )
+        use_chinese = data.BAR_WORKSPACE_USE_CHINESE_NUMERALS
         orientation = "h" if not data.VERTICAL else "v"
 
         # Рабочие столы без номеров
@@ -168,7 +195,7 @@ class Bar(Window):
         )
 
         # Рабочие столы с номерами
-        spacing = 0 if not data.BAR_WORKSPACE_USE_CHINESE_NUMERALS else 4
+        spacing = 0 if not use_chinese else 4
         self.workspaces_num = Workspaces(
             name="workspaces-num",
             invert_scroll=True,
@@ -200,7 +227,7 @@ class Bar(Window):
         button = Button(
             name=name,
             tooltip_markup=tooltip,
-            on_clicked=lambda *_: callback(),
+            on_clicked=lambda *_a, cb=callback: cb(),
             child=Label(name="button-bar-label", markup=icon),
         )
         button.connect("enter_notify_event", self.on_button_enter)
@@ -212,20 +239,24 @@ class Bar(Window):
         self.connection = get_hyprland_connection()
 
         self.button_apps = self._create_bar_button(
-            TOOLTIP_APPS, icons.apps, self.search_apps
+            TOOLTIP_APPS, icons.apps, partial(self._open_notch, "launcher")
         )
         self.button_tools = self._create_bar_button(
-            TOOLTIP_TOOLS, icons.toolbox, self.tools_menu
+            TOOLTIP_TOOLS, icons.toolbox, partial(self._open_notch, "tools")
         )
         self.button_power = self._create_bar_button(
-            TOOLTIP_POWER, icons.shutdown, self.power_menu
+            TOOLTIP_POWER, icons.shutdown, partial(self._open_notch, "power")
         )
         self.button_overview = self._create_bar_button(
-            TOOLTIP_OVERVIEW, icons.windows, self.overview
+            TOOLTIP_OVERVIEW, icons.windows, partial(self._open_notch, "overview")
         )
 
         # Кнопка языка
         self.lang_label = Label(name="lang-label")
+        if data.VERTICAL:
+            # В вертикальном режиме показывается только иконка клавиатуры
+            self.lang_label.add_style_class("icon")
+            self.lang_label.set_markup(icons.keyboard)
         self.language = Button(
             name="language",
             h_align="center",
@@ -262,10 +293,35 @@ class Bar(Window):
             style_classes=["vertical"] if data.VERTICAL else [],
         )
 
+        # Словарь компонентов строится один раз — набор виджетов не меняется
+        self._components: Dict[str, Any] = {
+            "button_apps": self.button_apps,
+            "systray": self.systray,
+            "control": self.control,
+            "network": self.network,
+            "button_tools": self.button_tools,
+            "button_overview": self.button_overview,
+            "ws_container": self.ws_container,
+            "weather": self.weather,
+            "battery": self.battery,
+            "metrics": self.metrics,
+            "language": self.language,
+            "date_time": self.date_time,
+            "button_power": self.button_power,
+            "sysprofiles": self.sysprofiles,
+        }
+        self._visibility_keys = frozenset(self.component_visibility)
+        self._invertible_children = tuple(
+            child for child in self._get_themed_children()
+            if hasattr(child, "add_style_class")
+        )
+
         self.apply_component_props()
 
-    def _create_revealer_box(self, children: List, transition: str, name: str = "bar-revealer") -> Box:
-        """Создать Box с Revealer"""
+    def _create_revealer_box(
+        self, children: Optional[List], transition: str, name: str = "bar-revealer"
+    ) -> Tuple[Revealer, Box]:
+        """Создать Revealer и обёртку Box для него"""
         revealer = Revealer(
             name=name,
             transition_type=transition,
@@ -274,90 +330,25 @@ class Bar(Window):
                 name="bar-revealer-box",
                 orientation="h",
                 spacing=4,
-                children=children if not data.VERTICAL else None,
+                children=children,
             ),
         )
-        return Box(name="boxed-revealer", children=[revealer])
+        return revealer, Box(name="boxed-revealer", children=[revealer])
 
     def _init_revealers(self):
         """Инициализировать Revealer'ы для панели"""
-        self.rev_right = [self.metrics, self.control]
-        self.revealer_right = Revealer(
-            name="bar-revealer",
-            transition_type="slide-left",
-            child_revealed=True,
-            child=Box(
-                name="bar-revealer-box",
-                orientation="h",
-                spacing=4,
-                children=self.rev_right if not data.VERTICAL else None,
-            ),
-        )
-        self.boxed_revealer_right = Box(
-            name="boxed-revealer",
-            children=[self.revealer_right],
-        )
+        # В вертикальном режиме виджеты размещаются напрямую, без Revealer'ов
+        vertical = data.VERTICAL
 
-        self.rev_left = [self.weather, self.sysprofiles, self.network]
-        self.revealer_left = Revealer(
-            name="bar-revealer",
-            transition_type="slide-right",
-            child_revealed=True,
-            child=Box(
-                name="bar-revealer-box",
-                orientation="h",
-                spacing=4,
-                children=self.rev_left if not data.VERTICAL else None,
-            ),
+        self.revealer_right, self.boxed_revealer_right = self._create_revealer_box(
+            None if vertical else [self.metrics, self.control],
+            "slide-left",
         )
-        self.boxed_revealer_left = Box(
-            name="boxed-revealer",
-            children=[self.revealer_left],
+        self.revealer_left, self.boxed_revealer_left = self._create_revealer_box(
+            None if vertical else [self.weather, self.sysprofiles, self.network],
+            "slide-right",
         )
 
-    def _get_layout_children(self) -> tuple:
-        """Получить списки дочерних элементов для разных режимов"""
-        # Горизонтальные дети
-        h_start = [
-            self.button_apps,
-            self.ws_container,
-            self.button_overview,
-            self.boxed_revealer_left,
-        ]
-        h_end = [
-            self.boxed_revealer_right,
-            self.battery,
-            self.systray,
-            self.button_tools,
-            self.language,
-            self.date_time,
-            self.button_power,
-        ]
-
-        # Вертикальные дети
-        v_start = [
-            self.button_apps,
-            self.systray,
-            self.control,
-            self.sysprofiles,
-            self.network,
-            self.button_tools,
-        ]
-        v_center = [
-            self.button_overview,
-            self.ws_container,
-            self.weather,
-        ]
-        v_end = [
-            self.battery,
-            self.metrics,
-            self.language,
-            self.date_time,
-            self.button_power,
-        ]
-
-        return h_start, h_end, v_start, v_center, v_end
-
     def _should_embed_dock(self) -> bool:
         """Определить, нужно ли встраивать док в панель"""
         return (
@@ -367,45 +358,82 @@ class Bar(Window):
 
     def _setup_layout(self):
         """Настроить layout панели"""
-        h_start, h_end, v_start, v_center, v_end = self._get_layout_children()
-
-        # Создание встроенного дока если необходимо
-        if self._should_embed_dock() and not data.VERTICAL:
-            self.dock_instance = Dock(integrated_mode=True)
-            self.integrated_dock_widget = self.dock_instance.wrapper
+        is_centered_bar = False
+        bar_center_actual_children = None
 
-        # Определение центральных детей
-        is_centered_bar = data.VERTICAL and getattr(data, "CENTERED_BAR", False)
-        v_all_children = v_start + v_center + v_end
+        if data.VERTICAL:
+            orientation = Gtk.Orientation.VERTICAL
+            is_centered_bar = getattr(data, "CENTERED_BAR", False)
+
+            start_children = [
+                self.button_apps,
+                self.systray,
+                self.control,
+                self.sysprofiles,
+                self.network,
+                self.button_tools,
+            ]
+            center_children = [
+                self.button_overview,
+                self.ws_container,
+                self.weather,
+            ]
+            end_children = [
+                self.battery,
+                self.metrics,
+                self.language,
+                self.date_time,
+                self.button_power,
+            ]
+
+            # Центрированная панель: все элементы в одном центральном блоке
+            if is_centered_bar:
+                center_children = start_children + center_children + end_children
 
-        bar_center_actual_children = None
-        if self.integrated_dock_widget is not None:
-            bar_center_actual_children = self.integrated_dock_widget
-        elif data.VERTICAL:
             bar_center_actual_children = Box(
                 orientation=Gtk.Orientation.VERTICAL,
                 spacing=4,
-                children=v_all_children if is_centered_bar else v_center,
+                children=center_children,
             )
+        else:
+            orientation = Gtk.Orientation.HORIZONTAL
+
+            start_children = [
+                self.button_apps,
+                self.ws_container,
+                self.button_overview,
+                self.boxed_revealer_left,
+            ]
+            end_children = [
+                self.boxed_revealer_right,
+                self.battery,
+                self.systray,
+                self.button_tools,
+                self.language,
+                self.date_time,
+                self.button_power,
+            ]
+
+            # Создание встроенного дока если необходимо
+            if self._should_embed_dock():
+                self.dock_instance = Dock(integrated_mode=True)
+                self.integrated_dock_widget = self.dock_instance.wrapper
+                bar_center_actual_children = self.integrated_dock_widget
+                self._invertible_children += (self.integrated_dock_widget,)
 
         # Создание контейнеров start и end
-        orientation = (
-            Gtk.Orientation.HORIZONTAL if not data.VERTICAL
-            else Gtk.Orientation.VERTICAL
-        )
-
         start_container = None if is_centered_bar else Box(
             name="start-container",
             spacing=4,
             orientation=orientation,
-            children=h_start if not data.VERTICAL else v_start,
+            children=start_children,
         )
 
         end_container = None if is_centered_bar else Box(
             name="end-container",
             spacing=4,
             orientation=orientation,
-            children=h_end if not data.VERTICAL else v_end,
+            children=end_children,
         )
 
         # Создание основного CenterBox
@@ -446,83 +474,58 @@ class Bar(Window):
 
     def _apply_theme(self):
         """Применить тему к панели"""
-        # Удаление старых классов темы
-        for theme_class in THEME_CLASSES:
-            self.bar_inner.remove_style_class(theme_class)
+        vertical = data.VERTICAL
+        bar_theme = data.BAR_THEME
 
         # Определение стиля на основе текущей темы
-        theme_map = {
-            "Pills": "pills",
-            "Dense": "dense",
-            "Edge": "edgecenter" if (data.VERTICAL and data.CENTERED_BAR) else "edge",
-        }
-        self.style = theme_map.get(data.BAR_THEME, "pills")
-        self.bar_inner.add_style_class(self.style)
+        theme_map = (
+            _THEME_MAP_V_CENTERED if (vertical and data.CENTERED_BAR)
+            else _THEME_MAP_DEFAULT
+        )
+        self.style = theme_map.get(bar_theme, "pills")
+
+        # Удаление только ранее применённого класса темы
+        if self._current_theme_class != self.style:
+            if self._current_theme_class:
+                self.bar_inner.remove_style_class(self._current_theme_class)
+            self.bar_inner.add_style_class(self.style)
+            self._current_theme_class = self.style
 
         # Применение стиля к встроенному доку
-        if self.integrated_dock_widget and hasattr(self.integrated_dock_widget, "add_style_class"):
-            for theme_class in ["pills", "dense", "edge"]:
-                style_context = self.integrated_dock_widget.get_style_context()
-                if style_context.has_class(theme_class):
-                    self.integrated_dock_widget.remove_style_class(theme_class)
-            self.integrated_dock_widget.add_style_class(self.style)
+        if self.integrated_dock_widget is not None:
+            dock_class = self.dock_instance.theme_class
+            if dock_class != self.style:
+                self.integrated_dock_widget.remove_style_class(dock_class)
+                self.integrated_dock_widget.add_style_class(self.style)
+                self.dock_instance.theme_class = self.style
 
         # Применение инвертированных стилей для Dense и Edge тем
-        if data.BAR_THEME in ["Dense", "Edge"]:
-            themed_children = self._get_themed_children()
-            for child in themed_children:
-                if hasattr(child, "add_style_class"):
-                    child.add_style_class("invert")
+        if bar_theme in ("Dense", "Edge"):
+            for child in self._invertible_children:
+                child.add_style_class("invert")
 
         # Применение стилей позиционирования
-        position_class_map = {
-            "Top": "top",
-            "Bottom": "bottom",
-            "Left": "left",
-            "Right": "right",
-        }
-        position_class = position_class_map.get(data.BAR_POSITION, "top")
+        position_class = _POSITION_CLASS.get(data.BAR_POSITION, "top")
         self.bar_inner.add_style_class(position_class)
 
-        if data.VERTICAL:
+        if vertical:
             self.bar_inner.add_style_class("vertical")
 
     def apply_component_props(self):
         """Применить свойства видимости к компонентам"""
-        components = self._get_components_dict()
-        for component_name, widget in components.items():
-            if component_name in self.component_visibility:
+        for component_name, widget in self._components.items():
+            if component_name in self._visibility_keys:
                 widget.set_visible(self.component_visibility[component_name])
 
-    def _get_components_dict(self) -> Dict[str, Any]:
-        """Получить словарь всех компонентов панели"""
-        return {
-            "button_apps": self.button_apps,
-            "systray": self.systray,
-            "control": self.control,
-            "network": self.network,
-            "button_tools": self.button_tools,
-            "button_overview": self.button_overview,
-            "ws_container": self.ws_container,
-            "weather": self.weather,
-            "battery": self.battery,
-            "metrics": self.metrics,
-            "language": self.language,
-            "date_time": self.date_time,
-            "button_power": self.button_power,
-            "sysprofiles": self.sysprofiles,
-        }
-
     def toggle_component_visibility(self, component_name: str) -> Optional[bool]:
         """Переключить видимость компонента"""
-        components = self._get_components_dict()
-
-        if component_name not in components or component_name not in self.component_visibility:
+        widget = self._components.get(component_name)
+        if widget is None or component_name not in self._visibility_keys:
             return None
 
         # Переключение видимости
         self.component_visibility[component_name] = not self.component_visibility[component_name]
-        components[component_name].set_visible(self.component_visibility[component_name])
+        widget.set_visible(self.component_visibility[component_name])
 
         # Сохранение в конфиг
         self._save_component_visibility(component_name)
@@ -530,54 +533,75 @@ class Bar(Window):
         return self.component_visibility[component_name]
 
     def _save_component_visibility(self, component_name: str):
-        """Сохранить видимость компонента в конфигурационный файл"""
-        config_file = os.path.expanduser(f"~/.config/{data.APP_NAME}/config/config.json")
+        """Запланировать сохранение видимости компонентов в конфигурационный файл"""
+        self._config_dirty.add(component_name)
+        if not self._config_flush_pending:
+            self._config_flush_pending = True
+            GLib.timeout_add(CONFIG_SAVE_DELAY, self._flush_config)
+
+    @property
+    def _config_cache(self) -> Optional[Dict[str, Any]]:
+        """Разобранный конфиг; перечитывается только если файл изменился извне"""
+        try:
+            mtime = os.stat(self._config_path).st_mtime
+        except FileNotFoundError:
+            self._config = None
+            return None
 
-        if not os.path.exists(config_file):
-            return
+        if self._config is None or mtime != self._config_mtime:
+            with open(self._config_path, "rb") as f:
+                self._config = json.loads(f.read())
+            self._config_mtime = mtime
+        return self._config
+
+    def _flush_config(self) -> bool:
+        """Записать накопленные изменения видимости в конфигурационный файл"""
+        self._config_flush_pending = False
+        if not self._config_dirty:
+            return GLib.SOURCE_REMOVE
+        dirty, self._config_dirty = self._config_dirty, set()
 
         try:
-            with open(config_file, "r") as f:
-                config = json.load(f)
+            config = self._config_cache
+            if config is None:
+                return GLib.SOURCE_REMOVE
 
-            config[f"bar_{component_name}_visible"] = self.component_visibility[component_name]
+            # Пишем только переключённые ключи, чтобы не затереть чужие изменения
+            for name in dirty:
+                config[f"bar_{name}_visible"] = self.component_visibility[name]
 
-            with open(config_file, "w") as f:
-                json.dump(config, f, indent=4)
-        except Exception as e:
-            print(f"Error updating config file: {e}")
+            # Атомарная запись с сохранением прав файла
+            write_file_atomic(self._config_path, json.dumps(config, indent=4).encode())
+            self._config_mtime = os.stat(self._config_path).st_mtime
+        except Exception:
+            logger.exception("Error updating config file")
+
+        return GLib.SOURCE_REMOVE
 
     def on_button_enter(self, widget, event):
         """Обработчик наведения курсора на кнопку"""
         window = widget.get_window()
-        if window:
-            window.set_cursor(Gdk.Cursor.new_from_name(widget.get_display(), "hand2"))
+        if not window:
+            return
+
+        display = widget.get_display()
+        cursor = self._cursor_cache.get(display)
+        if cursor is None:
+            cursor = Gdk.Cursor.new_from_name(display, "hand2")
+            self._cursor_cache[display] = cursor
+        window.set_cursor(cursor)
 
     def on_button_leave(self, widget, event):
         """Обработчик ухода курсора с кнопки"""
         window = widget.get_window()
-        if window:
+        # Курсор уже сброшен — лишний запрос к композитору не нужен
+        if window and window.get_cursor() is not None:
             window.set_cursor(None)
 
-    def search_apps(self):
-        """Открыть лаунчер приложений"""
-        if self.notch:
-            self.notch.open_notch("launcher")
-
-    def overview(self):
-        """Открыть обзор окон"""
-        if self.notch:
-            self.notch.open_notch("overview")
-
-    def power_menu(self):
-        """Открыть меню питания"""
+    def _open_notch(self, widget_name: str):
+        """Открыть указанный раздел notch (лаунчер, обзор, питание, инструменты)"""
         if self.notch:
-            self.notch.open_notch("power")
-
-    def tools_menu(self):
-        """Открыть меню инструментов"""
-        if self.notch:
-            self.notch.open_notch("tools")
+            self.notch.open_notch(widget_name)
 
     def on_language_switch(self, _=None, event: HyprlandEvent = None):
         """Обработчик переключения языка клавиатуры"""
@@ -590,13 +614,15 @@ class Bar(Window):
         except (json.JSONDecodeError, IndexError):
             lang_data = "UNK"
 
+        # Hyprland часто присылает повторные события с той же раскладкой
+        if lang_data == self._last_lang:
+            return
+        self._last_lang = lang_data
+
         self.language.set_tooltip_text(lang_data)
 
         if not data.VERTICAL:
             self.lang_label.set_label(lang_data[:3].upper())
-        else:
-            self.lang_label.add_style_class("icon")
-            self.lang_label.set_markup(icons.keyboard)
 
     def toggle_hidden(self):
         """Переключить скрытие панели"""
@@ -609,11 +635,7 @@ class Bar(Window):
 
         # Поднять notch над панелью когда панель показана
         if self.notch and not self.hidden:
-            GLib.idle_add(
-                lambda: exec_shell_command_async(
-                    "hyprctl dispatch focuswindow class:notch"
-                ) if self.notch else None
-            )
+            exec_shell_command_async(FOCUS_NOTCH_COMMAND)
 
     def chinese_numbers(self):
         """Применить стили для китайских цифр"""
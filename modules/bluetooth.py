@@ -1,3 +1,7 @@
+import bisect
+import weakref
+from operator import attrgetter
+
 from fabric.bluetooth import BluetoothClient, BluetoothDevice
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
@@ -9,6 +13,17 @@ from gi.repository import Gdk, GLib
 import modules.icons as icons
 from .buttons import add_hover_cursor
 
+# Задержка (мс) перед пересортировкой списка устройств
+RESORT_DELAY_MS = 150
+
+_slot_sort_key = attrgetter("_sort_key")
+
+# Иконки состояний, разрешённые один раз при загрузке модуля
+_ICON_CONNECTED = icons.bluetooth_connected
+_ICON_DISCONNECTED = icons.bluetooth_disconnected
+_ICON_BT = icons.bluetooth
+_ICON_BT_OFF = icons.bluetooth_off
+
 
 class BluetoothDeviceSlot(CenterBox):
     """
@@ -25,16 +40,22 @@ class BluetoothDeviceSlot(CenterBox):
         super().__init__(name="bluetooth-device", **kwargs)
 
         self.device = device
-        self.owner = owner
+        # Сбрасывается при закрытии устройства; дешёвая проверка в обработчиках
+        self._alive = True
+        # Слабая ссылка: владелец держит слот как дочерний виджет, цикл не нужен
+        self._owner_ref = weakref.ref(owner)
 
-        # Кеш состояний для избежания лишних обновлений UI
-        self._cached_connected = None
-        self._cached_connecting = None
-        self._cached_label = None
+        # Кеш состояний для избежания лишних обновлений UI:
+        # (connected, connecting, paired) на момент последнего обновления
+        self._state = None
+        self._cached_button_label = None
 
-        # Debouncing для пересортировки
-        self._resort_timeout_id = None
-        self._resort_delay_ms = 150
+        # Неизменяемые данные устройства — читаются из D-Bus прокси один раз
+        self.address = device.address
+        self._name_key = (device.name or "").lower()
+
+        # Ключ сортировки: подключённые сверху, далее по имени
+        self._sort_key = (not device.connected, self._name_key)
 
         # Идентификаторы сигналов для корректного отключения
         self._changed_handler_id = self.device.connect("changed", self.on_changed)
@@ -47,8 +68,7 @@ class BluetoothDeviceSlot(CenterBox):
         self.paired_on_init = device.paired
         self.connected_on_init = device.connected
 
-        # Первичное обновление UI (принудительно)
-        self._cached_connected = None  # Сбросить кеш для первого обновления
+        # Первичное обновление UI (кеш состояния пуст — обновится всё)
         self.device.emit("changed")
 
     def _create_ui_elements(self):
@@ -58,7 +78,7 @@ class BluetoothDeviceSlot(CenterBox):
         # Иконка состояния подключения
         self.connection_label = Label(
             name="bluetooth-connection",
-            markup=icons.bluetooth_disconnected,
+            markup=_ICON_DISCONNECTED,
         )
 
         # Кнопка подключения/отключения
@@ -79,7 +99,7 @@ class BluetoothDeviceSlot(CenterBox):
             h_expand=True,
             h_align="start",
             ellipsization="end",
-            tooltip_text=device.address,
+            tooltip_text=self.address,
         )
 
         # Левая часть: иконка + имя + статус
@@ -100,33 +120,34 @@ class BluetoothDeviceSlot(CenterBox):
         ]
 
         # Правая часть: кнопки управления
-        if device.paired:
-            self.forget_button = Button(
-                name="bluetooth-forget",
-                label="Forget",
-                tooltip_text="Remove this device from paired list",
-                on_clicked=lambda *_: self._safe_remove_device(),
-                style_classes=["destructive"],
-            )
-            add_hover_cursor(self.forget_button)
-            self.end_children = Box(
-                spacing=4,
-                children=[self.connect_button, self.forget_button],
-            )
-        else:
-            self.end_children = self.connect_button
+        # Кнопка "Forget" создаётся всегда и показывается только для paired
+        self.forget_button = Button(
+            name="bluetooth-forget",
+            label="Forget",
+            tooltip_text="Remove this device from paired list",
+            on_clicked=lambda *_: self._safe_remove_device(),
+            style_classes=["destructive"],
+        )
+        self.forget_button.set_no_show_all(True)
+        self.forget_button.set_visible(device.paired)
+        add_hover_cursor(self.forget_button)
+        self.end_children = Box(
+            spacing=4,
+            children=[self.connect_button, self.forget_button],
+        )
 
     # ═════════════════════════════════════════════════════════════
     # Вспомогательные методы
     # ═════════════════════════════════════════════════════════════
 
+    @property
+    def owner(self):
+        """Владелец слота (BluetoothConnections) или None, если он уничтожен"""
+        return self._owner_ref() if self._owner_ref is not None else None
+
     def _is_device_valid(self) -> bool:
         """Проверка, что устройство ещё активное и не закрыто"""
-        return (
-            hasattr(self, "device") 
-            and self.device is not None
-            and not getattr(self.device, "closed", False)
-        )
+        return self._alive
 
     def _safe_remove_device(self):
         """Безопасное удаление устройства с обработкой ошибок"""
@@ -140,6 +161,10 @@ class BluetoothDeviceSlot(CenterBox):
 
     def _on_closed(self, *_):
         """Устройство закрыто — отцепить сигналы и уничтожить виджет"""
+        self._alive = False
+        owner = self.owner
+        if owner is not None:
+            owner._forget_slot(self)
         self._cleanup()
 
         # Отложенное уничтожение для избежания конфликтов
@@ -147,24 +172,17 @@ class BluetoothDeviceSlot(CenterBox):
 
     def _cleanup(self):
         """Очистка ресурсов и отключение сигналов"""
-        # Отменить отложенную пересортировку
-        if self._resort_timeout_id is not None:
-            GLib.source_remove(self._resort_timeout_id)
-            self._resort_timeout_id = None
-
-        # Отключить сигналы устройства
-        if self._is_device_valid():
-            try:
-                if self._changed_handler_id:
-                    self.device.disconnect(self._changed_handler_id)
-                if self._closed_handler_id:
-                    self.device.disconnect(self._closed_handler_id)
-            except Exception:
-                pass
+        # Отключить сигналы устройства (в т.ч. уже закрытого)
+        device = self.device
+        if device is not None:
+            for handler_id in (self._changed_handler_id, self._closed_handler_id):
+                if handler_id and device.handler_is_connected(handler_id):
+                    device.disconnect(handler_id)
 
         # Очистить ссылки
+        self._alive = False
         self.device = None
-        self.owner = None
+        self._owner_ref = None
 
     # ═════════════════════════════════════════════════════════════
     # Обработчики событий
@@ -190,172 +208,76 @@ class BluetoothDeviceSlot(CenterBox):
 
     def on_changed(self, *_):
         """Обновить UI в зависимости от состояния устройства"""
-        if not self._is_device_valid():
+        # Единственная проверка: под-обновления получают уже прочитанное состояние
+        if not self._alive:
             return
 
-        self._update_connection_icon()
-        self._update_connect_button()
-        self._handle_device_state_change()
-
-    def _update_connection_icon(self):
-        """Обновить иконку статуса подключения"""
-        if not self._is_device_valid():
+        # ✅ "changed" приходит и для неотображаемых свойств (rssi, battery...)
+        device = self.device
+        state = (device.connected, device.connecting, device.paired)
+        prev_state = self._state
+        if state == prev_state:
             return
+        self._state = state
 
-        # ✅ Кеширование: обновлять только если изменилось
-        connected = self.device.connected
-        if self._cached_connected == connected:
-            return
+        connected, connecting, paired = state
+        prev_connected, prev_connecting, prev_paired = prev_state or (None, None, None)
 
-        self._cached_connected = connected
-        icon = (
-            icons.bluetooth_connected
-            if connected
-            else icons.bluetooth_disconnected
-        )
-        self.connection_label.set_markup(icon)
+        if paired != prev_paired:
+            self.forget_button.set_visible(paired)
 
-    def _update_connect_button(self):
-        """Обновить кнопку подключения"""
-        if not self._is_device_valid():
-            return
+        if connected != prev_connected:
+            self._update_connection_icon(connected)
+        if connected != prev_connected or connecting != prev_connecting:
+            self._update_connect_button(connected, connecting)
+        self._handle_device_state_change(connected, paired)
 
-        connecting = self.device.connecting
-        connected = self.device.connected
+    def _update_connection_icon(self, connected: bool):
+        """Обновить иконку статуса подключения"""
+        self._sort_key = (not connected, self._name_key)
+        self.connection_label.set_markup(
+            _ICON_CONNECTED if connected else _ICON_DISCONNECTED
+        )
 
+    def _update_connect_button(self, connected: bool, connecting: bool):
+        """Обновить кнопку подключения"""
         # Состояние "Connecting..."
         if connecting:
-            if self._cached_connecting != True:
-                self._cached_connecting = True
-                self._cached_label = "Connecting..."
-                self.connect_button.set_label("Connecting...")
-                self.connect_button.set_sensitive(False)
-            return
-
-        # ✅ Кеширование: обновлять только если изменилось
-        if self._cached_connecting == False and self._cached_connected == connected:
-            return
+            new_label = "Connecting..."
+            self.connect_button.set_sensitive(False)
+        else:
+            new_label = "Disconnect" if connected else "Connect"
+            self.connect_button.set_sensitive(True)
 
-        self._cached_connecting = False
-        self._cached_connected = connected
+            # Стили
+            if connected:
+                self.connect_button.add_style_class("connected")
+            else:
+                self.connect_button.remove_style_class("connected")
 
-        # Обычное состояние
-        new_label = "Disconnect" if connected else "Connect"
-        if self._cached_label != new_label:
-            self._cached_label = new_label
+        if self._cached_button_label != new_label:
+            self._cached_button_label = new_label
             self.connect_button.set_label(new_label)
 
-        self.connect_button.set_sensitive(True)
-
-        # Стили
-        if connected:
-            self.connect_button.add_style_class("connected")
-        else:
-            self.connect_button.remove_style_class("connected")
-
     # ═════════════════════════════════════════════════════════════
     # Перестановка и сортировка
     # ═════════════════════════════════════════════════════════════
 
-    def _handle_device_state_change(self):
+    def _handle_device_state_change(self, connected: bool, paired: bool):
         """Переставить виджет при изменении paired/connected"""
-        if not self._is_device_valid():
-            return
-
-        if (
-            self.device.paired != self.paired_on_init
-            or self.device.connected != self.connected_on_init
-        ):
+        if paired != self.paired_on_init or connected != self.connected_on_init:
             self._reposition_slot()
-            self.paired_on_init = self.device.paired
-            self.connected_on_init = self.device.connected
+            self.paired_on_init = paired
+            self.connected_on_init = connected
 
     def _reposition_slot(self):
         """Переместить слот в нужный box"""
-        if not getattr(self, "owner", None) or not self._is_device_valid():
-            return
-
-        try:
-            current_parent = self.get_parent()
-            target_box = (
-                self.owner.paired_box if self.device.paired
-                else self.owner.available_box
-            )
-
-            # Переместить виджет если нужен другой box
-            if current_parent is not target_box:
-                if current_parent:
-                    current_parent.remove(self)
-                target_box.add(self)
-
-                # ✅ Debounced resort: отложенная пересортировка
-                self._schedule_resort(target_box)
-
-        except RuntimeError:
-            # Виджет или контейнер были уничтожены
-            pass
-        except Exception as e:
-            print(f"⚠️ Repositioning error: {e}")
-
-    def _schedule_resort(self, box: Box):
-        """Запланировать пересортировку с debouncing"""
-        # Отменить предыдущий таймер
-        if self._resort_timeout_id is not None:
-            GLib.source_remove(self._resort_timeout_id)
-
-        # Запланировать новую пересортировку
-        self._resort_timeout_id = GLib.timeout_add(
-            self._resort_delay_ms,
-            self._resort_callback,
-            box
-        )
-
-    def _resort_callback(self, box: Box) -> bool:
-        """Callback для отложенной пересортировки"""
-        self._resort_box(box)
-        self._resort_timeout_id = None
-        return False  # Не повторять
-
-    def _resort_box(self, box: Box):
-        """
-        Поддерживать порядок: подключённые сверху, далее по имени
-
-        ✅ Оптимизация: сортировать только если порядок неправильный
-        """
-        if not box:
+        owner = self.owner
+        if owner is None:
             return
 
-        try:
-            children = [
-                c for c in box.get_children()
-                if hasattr(c, "device") and c._is_device_valid()
-            ]
-
-            if not children:
-                return
-
-            # Сортировка: подключённые первыми, затем по алфавиту
-            sorted_children = sorted(
-                children,
-                key=lambda child: (
-                    not child.device.connected,  # False < True, подключённые сверху
-                    getattr(child.device, "name", "").lower(),
-                ),
-            )
-
-            # ✅ Проверка: нужна ли пересортировка?
-            if children == sorted_children:
-                return
-
-            # Пересортировка
-            for child in children:
-                box.remove(child)
-
-            for child in sorted_children:
-                box.add(child)
-
-        except Exception as e:
-            print(f"⚠️ Resort error: {e}")
+        # ✅ Debounced: владелец переставит слот в нужный box и позицию
+        owner._request_resort(self)
 
 
 # ═════════════════════════════════════════════════════════════════
@@ -387,6 +309,21 @@ class BluetoothConnections(Box):
         self._cached_enabled = None
         self._cached_scanning = None
 
+        # Слоты по адресу устройства: O(1) поиск и защита от дублей
+        self._slots = {}
+
+        # Debouncing для перестановки: один таймер на все слоты
+        self._pending_resort = set()
+        self._resort_timeout_id = None
+
+        # Новые слоты добавляются пачкой в idle (всплеск при сканировании)
+        self._pending_add = set()
+        self._add_idle_id = None
+
+        # destroy приходит и при уничтожении родителем со стороны C,
+        # когда Python-переопределение destroy() не вызывается
+        self.connect("destroy", self._on_destroy)
+
         # Ссылки на виджеты статуса
         self._init_status_widgets()
 
@@ -397,12 +334,12 @@ class BluetoothConnections(Box):
         self._create_ui()
 
         # Подключить сигналы
-        self.client.connect("notify::enabled", lambda *_: self.update_status())
-        self.client.connect("notify::scanning", lambda *_: self.update_scan_label())
+        self.client.connect("notify::enabled", self._on_enabled_notify)
+        self.client.connect("notify::scanning", self._on_scanning_notify)
 
-        # Первичное обновление
-        self.client.notify("scanning")
-        self.client.notify("enabled")
+        # Первичное обновление напрямую, без эмиссии notify
+        self.update_scan_label()
+        self.update_status()
 
     def _init_status_widgets(self):
         """Инициализация ссылок на виджеты статуса"""
@@ -423,6 +360,12 @@ class BluetoothConnections(Box):
             self.bt_menu_label,
         ]
 
+        # ✅ Style context'ы виджетов статуса и применён ли класс "disabled"
+        self._status_style_contexts = tuple(
+            widget.get_style_context() for widget in self._status_widgets_list
+        )
+        self._disabled_applied = False
+
     def _create_ui(self):
         """Создание UI элементов"""
         # Кнопка сканирования
@@ -447,6 +390,9 @@ class BluetoothConnections(Box):
         self.paired_box = Box(spacing=2, orientation="vertical")
         self.available_box = Box(spacing=2, orientation="vertical")
 
+        # Слоты каждого box в порядке отображения (отсортированы по _sort_key)
+        self._order = {self.paired_box: [], self.available_box: []}
+
         # Контент
         content_box = Box(spacing=4, orientation="vertical")
         content_box.add(self.paired_box)
@@ -478,6 +424,14 @@ class BluetoothConnections(Box):
     # Обработчики событий
     # ═════════════════════════════════════════════════════════════
 
+    def _on_enabled_notify(self, _client, _pspec):
+        """Обработчик notify::enabled"""
+        self.update_status()
+
+    def _on_scanning_notify(self, _client, _pspec):
+        """Обработчик notify::scanning"""
+        self.update_scan_label()
+
     def _toggle_scan(self):
         """Переключить сканирование с обработкой ошибок"""
         try:
@@ -487,6 +441,10 @@ class BluetoothConnections(Box):
 
     def on_device_added(self, client: BluetoothClient, address: str):
         """Добавить новое устройство в список"""
+        # BluetoothClient повторно шлёт device-added при пересканировании
+        if address in self._slots:
+            return
+
         try:
             device = client.get_device(address)
             if not device:
@@ -494,14 +452,167 @@ class BluetoothConnections(Box):
 
             # Создать слот для устройства
             slot = BluetoothDeviceSlot(device, owner=self)
+            self._slots[address] = slot
 
-            # Добавить в нужный box
-            target_box = self.paired_box if device.paired else self.available_box
-            target_box.add(slot)
+            # Добавить в нужный box пачкой вместе с остальными новыми слотами
+            self._pending_add.add(slot)
+            if self._add_idle_id is None:
+                self._add_idle_id = GLib.idle_add(self._flush_added)
 
         except Exception as e:
             print(f"⚠️ Error adding Bluetooth device: {e}")
 
+    # ═════════════════════════════════════════════════════════════
+    # Перестановка и сортировка
+    # ═════════════════════════════════════════════════════════════
+
+    def _freeze_boxes(self):
+        """Отложить уведомления о дочерних виджетах на время перестановок"""
+        self.paired_box.freeze_child_notify()
+        self.available_box.freeze_child_notify()
+
+    def _thaw_boxes(self):
+        """Возобновить уведомления о дочерних виджетах"""
+        self.available_box.thaw_child_notify()
+        self.paired_box.thaw_child_notify()
+
+    def _flush_added(self) -> bool:
+        """Разместить все новые слоты за один проход"""
+        self._add_idle_id = None
+        pending, self._pending_add = self._pending_add, set()
+
+        self._freeze_boxes()
+        try:
+            for slot in pending:
+                if slot._is_device_valid():
+                    self._place_slot(slot)
+        finally:
+            self._thaw_boxes()
+        return False  # Не повторять
+
+    def _request_resort(self, slot: BluetoothDeviceSlot):
+        """Запланировать перестановку слота с debouncing"""
+        # Ещё не размещённый слот встанет на место при добавлении
+        if slot in self._pending_add:
+            return
+
+        self._pending_resort.add(slot)
+        if self._resort_timeout_id is None:
+            self._resort_timeout_id = GLib.timeout_add(
+                RESORT_DELAY_MS, self._flush_resort
+            )
+
+    def _flush_resort(self) -> bool:
+        """Переставить все отмеченные слоты за один проход"""
+        self._resort_timeout_id = None
+        pending, self._pending_resort = self._pending_resort, set()
+
+        # ✅ Дешёвая проверка по кешированным ключам: порядок уже верный
+        if all(self._is_in_place(slot) for slot in pending):
+            return False
+
+        self._freeze_boxes()
+        try:
+            # Сначала убрать слоты из индексов: их ключи сортировки уже изменились
+            for slot in pending:
+                self._unindex_slot(slot)
+            for slot in pending:
+                if slot._is_device_valid():
+                    self._place_slot(slot)
+        finally:
+            self._thaw_boxes()
+        return False  # Не повторять
+
+    def cleanup(self):
+        """Снять отложенные перестановки и добавления"""
+        if self._resort_timeout_id is not None:
+            GLib.source_remove(self._resort_timeout_id)
+            self._resort_timeout_id = None
+        if self._add_idle_id is not None:
+            GLib.source_remove(self._add_idle_id)
+            self._add_idle_id = None
+        self._pending_resort.clear()
+        self._pending_add.clear()
+
+    def _on_destroy(self, *_):
+        self.cleanup()
+
+    def destroy(self):
+        """Переопределение destroy: очистка до уничтожения виджета"""
+        self.cleanup()
+        super().destroy()
+
+    def _target_box(self, slot: BluetoothDeviceSlot) -> Box:
+        """Box, в котором должен находиться слот"""
+        return self.paired_box if slot.device.paired else self.available_box
+
+    def _is_in_place(self, slot: BluetoothDeviceSlot) -> bool:
+        """
+        Слот в нужном box и упорядочен относительно соседей
+
+        Меняются только ключи отложенных слотов, поэтому если каждый из них
+        упорядочен с соседями, то и весь список отсортирован.
+        """
+        if not slot._is_device_valid():
+            return True
+
+        target_box = self._target_box(slot)
+        if slot.get_parent() is not target_box:
+            return False
+
+        order = self._order[target_box]
+        try:
+            index = order.index(slot)
+        except ValueError:
+            return False
+
+        key = slot._sort_key
+        if index > 0 and order[index - 1]._sort_key > key:
+            return False
+        if index + 1 < len(order) and key > order[index + 1]._sort_key:
+            return False
+        return True
+
+    def _unindex_slot(self, slot: BluetoothDeviceSlot):
+        """Убрать слот из отсортированного индекса его текущего box"""
+        order = self._order.get(slot.get_parent())
+        if order is not None and slot in order:
+            order.remove(slot)
+
+    def _forget_slot(self, slot: BluetoothDeviceSlot):
+        """Забыть закрытый слот"""
+        if self._slots.get(slot.address) is slot:
+            del self._slots[slot.address]
+        self._pending_resort.discard(slot)
+        self._pending_add.discard(slot)
+        self._unindex_slot(slot)
+
+    def _place_slot(self, slot: BluetoothDeviceSlot):
+        """
+        Вставить слот в нужный box: подключённые сверху, далее по имени
+
+        ✅ Оптимизация: бинарный поиск позиции и один reorder_child
+        """
+        try:
+            target_box = self._target_box(slot)
+            order = self._order[target_box]
+            index = bisect.bisect(order, slot._sort_key, key=_slot_sort_key)
+            order.insert(index, slot)
+
+            # Переместить виджет если нужен другой box
+            current_parent = slot.get_parent()
+            if current_parent is not target_box:
+                if current_parent:
+                    current_parent.remove(slot)
+                target_box.add(slot)
+            target_box.reorder_child(slot, index)
+
+        except RuntimeError:
+            # Виджет или контейнер были уничтожены
+            pass
+        except Exception as e:
+            print(f"⚠️ Repositioning error: {e}")
+
     # ═════════════════════════════════════════════════════════════
     # Обновление UI
     # ═════════════════════════════════════════════════════════════
@@ -522,16 +633,20 @@ class BluetoothConnections(Box):
 
         if enabled:
             self.bt_status_text.set_label("Enabled")
-            self.bt_icon.set_markup(icons.bluetooth)
-
-            for widget in self._status_widgets_list:
-                widget.remove_style_class("disabled")
+            self.bt_icon.set_markup(_ICON_BT)
         else:
             self.bt_status_text.set_label("Disabled")
-            self.bt_icon.set_markup(icons.bluetooth_off)
-
-            for widget in self._status_widgets_list:
-                widget.add_style_class("disabled")
+            self.bt_icon.set_markup(_ICON_BT_OFF)
+
+        # Класс "disabled" переключается одним проходом по style context'ам
+        disabled = not enabled
+        if self._disabled_applied != disabled:
+            self._disabled_applied = disabled
+            for style_context in self._status_style_contexts:
+                if disabled:
+                    style_context.add_class("disabled")
+                else:
+                    style_context.remove_class("disabled")
 
     def update_scan_label(self):
         """
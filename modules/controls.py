@@ -1,3 +1,5 @@
+from bisect import bisect_left, bisect_right
+from functools import cache
 from typing import Optional, Callable
 
 from fabric.audio.service import Audio
@@ -13,9 +15,333 @@ from gi.repository import Gdk, GLib
 import config.data as data
 import modules.icons as icons
 from services.brightness import Brightness
+from utils import tick
+
+# Окно (мс), в котором серия сигналов "changed" схлопывается в одно обновление UI
+CHANGED_COALESCE_MS = 50
+
+# Адаптивный debounce: после паузы дольше ADAPTIVE_IDLE_GAP_US изменение
+# применяется сразу, в серии — с задержкой в половину интервала между событиями
+ADAPTIVE_IDLE_GAP_US = 400_000
+ADAPTIVE_MIN_DELAY_MS = 10
+
+# Ступени иконки яркости: < 24% — low, < 75% — medium, иначе high
+_BRIGHTNESS_THRESHOLDS = (24, 75)
+_BRIGHTNESS_ICONS = (
+    icons.brightness_low,
+    icons.brightness_medium,
+    icons.brightness_high,
+)
+
+# Ступени иконки громкости: 0 — off, до 74 включительно — medium, выше — high
+_VOLUME_THRESHOLDS = (0, 74)
+
+# Наборы иконок динамика: индексы ступеней громкости + muted
+_ICON_MUTE = 3
+_ICONS_SPK = (icons.vol_mute, icons.vol_medium, icons.vol_high, icons.vol_off)
+_ICONS_BT = (
+    icons.bluetooth_disconnected,
+    icons.bluetooth,
+    icons.bluetooth_connected,
+    icons.bluetooth_off,
+)
+
+# Верхняя граница громкости при прокрутке компактных элементов (с усилением)
+SCROLL_VOLUME_MAX = 150
+
+# Направление дискретной прокрутки → знак изменения значения
+_SCROLL_SIGN = {
+    Gdk.ScrollDirection.UP: 1,
+    Gdk.ScrollDirection.DOWN: -1,
+}
+
+
+def _scroll_sign(event) -> int:
+    """Знак шага для scroll-события: +1 вверх, -1 вниз, 0 — игнорировать"""
+    direction = event.direction
+    if direction == Gdk.ScrollDirection.SMOOTH:
+        delta_y = event.delta_y
+        # Ось y у smooth-прокрутки инвертирована относительно UP/DOWN
+        return (delta_y < 0) - (delta_y > 0)
+    return _SCROLL_SIGN.get(direction, 0)
+
+
+@cache
+def _has_brightness() -> bool:
+    """
+    Доступна ли регулировка яркости. Проверяется один раз за процесс:
+    чтение screen_brightness обращается к бэкенду (sysfs/ddcutil).
+    """
+    return Brightness.get_initial().screen_brightness != -1
+
+
+class DeferredCall:
+    """
+    Отложенный вызов для debouncing поверх общего планировщика utils.tick
+
+    Все элементы управления делят один таймер GLib; перевзвод — перенос
+    дедлайна в куче, без source_remove на каждое событие прокрутки.
+    """
+
+    def __init__(self, callback: Callable[[], None]):
+        self._deferred_callback = callback
+        self._last_schedule_us = 0
+
+    def schedule(self, delay_ms: int):
+        """Сработать через delay_ms; повторный вызов переносит срабатывание"""
+        tick.schedule(self, GLib.get_monotonic_time() + delay_ms * 1000, self._deferred_callback)
+
+    def schedule_adaptive(self, max_delay_ms: int):
+        """Задержка по интервалу между вызовами, не больше max_delay_ms"""
+        now = GLib.get_monotonic_time()
+        gap = now - self._last_schedule_us
+        self._last_schedule_us = now
+        if gap > ADAPTIVE_IDLE_GAP_US:
+            delay_ms = 0
+        else:
+            delay_ms = min(max_delay_ms, max(ADAPTIVE_MIN_DELAY_MS, gap // 2000))
+        tick.schedule(self, now + delay_ms * 1000, self._deferred_callback)
+
+    def destroy(self):
+        """Отменить запланированный вызов"""
+        tick.cancel(self)
+
+
+class StreamBinding:
+    """
+    Подписка на сигналы текущего аудиопотока
+
+    bind() идемпотентен: при смене устройства обработчики снимаются со
+    старого потока, поэтому они не копятся после каждого hotplug.
+    """
+
+    def __init__(self, handlers: dict[str, Callable]):
+        self._handlers = handlers
+        self._stream = None
+        self._handler_ids: tuple[int, ...] = ()
+
+    def bind(self, stream) -> bool:
+        """Привязаться к stream; False, если он уже привязан"""
+        if stream is self._stream:
+            return False
+        self.unbind()
+        if stream is not None:
+            self._stream = stream
+            self._handler_ids = tuple(
+                stream.connect(signal, handler)
+                for signal, handler in self._handlers.items()
+            )
+        return True
+
+    def unbind(self):
+        """Отключить все обработчики от текущего потока"""
+        stream = self._stream
+        if stream is not None:
+            for handler_id in self._handler_ids:
+                if stream.handler_is_connected(handler_id):
+                    stream.disconnect(handler_id)
+        self._stream = None
+        self._handler_ids = ()
+
+
+class BrightnessWriter:
+    """
+    Общий почтовый ящик записи яркости (latest-wins)
+
+    Слайдер, компактный элемент и иконка кладут сюда значение, а запись в
+    сервис выполняется один раз за итерацию главного цикла — только
+    последнего значения. Сравнение идёт с закэшированной яркостью бэкенда:
+    чтение screen_brightness у ddcutil — синхронный вызов getvcp в главном
+    цикле, да ещё и с сигналом brightness_changed.
+    """
+
+    instance: Optional["BrightnessWriter"] = None
+
+    @staticmethod
+    def get_initial() -> "BrightnessWriter":
+        if BrightnessWriter.instance is None:
+            BrightnessWriter.instance = BrightnessWriter(Brightness.get_initial())
+        return BrightnessWriter.instance
+
+    def __init__(self, client: Brightness):
+        self._client = client
+        self._mailbox: Optional[float] = None
+        self._idle_id: Optional[int] = None
+
+    def post(self, value: float):
+        """Запланировать запись; непримененное предыдущее значение вытесняется"""
+        self._mailbox = value
+        if self._idle_id is None:
+            self._idle_id = GLib.idle_add(self._drain)
+
+    def _drain(self) -> bool:
+        self._idle_id = None
+        value, self._mailbox = self._mailbox, None
+        if value is not None and value != self._client.get_cached_brightness():
+            self._client.screen_brightness = value
+        return False
+
+    def current(self) -> float:
+        """Ожидающее записи значение либо закэшированная яркость, без чтения устройства"""
+        if self._mailbox is not None:
+            return self._mailbox
+        return self._client.get_cached_brightness()
+
+
+class CachedLabel(Label):
+    """Label, пропускающий set_markup с тем же markup (без разбора Pango и relayout)"""
+
+    def set_markup(self, markup: str):
+        if markup != getattr(self, "_last_markup", None):
+            self._last_markup = markup
+            super().set_markup(markup)
+
+
+class LazyTooltipMixin:
+    """
+    Tooltip, который обновляется только пока его видно
+
+    Пока курсор не над виджетом, текст лишь запоминается и применяется
+    при первом query-tooltip. Тот же текст повторно не устанавливается.
+    """
+
+    def _init_lazy_tooltip(self):
+        self._tooltip_visible = False
+        self._pending_tooltip: Optional[str] = None
+        self._applied_tooltip: Optional[str] = None
+        self.set_has_tooltip(True)
+        self.connect("query-tooltip", self._on_query_tooltip)
+        self.connect("leave-notify-event", self._on_tooltip_leave)
+
+    def _set_tooltip(self, text: str):
+        """Установить tooltip сразу или отложить до наведения"""
+        if text == self._applied_tooltip:
+            self._pending_tooltip = None
+        elif self._tooltip_visible:
+            self._pending_tooltip = None
+            self._applied_tooltip = text
+            self.set_tooltip_text(text)
+        else:
+            self._pending_tooltip = text
+
+    def _on_query_tooltip(self, *_):
+        self._tooltip_visible = True
+        if self._pending_tooltip is not None:
+            self._applied_tooltip = self._pending_tooltip
+            self.set_tooltip_text(self._pending_tooltip)
+            self._pending_tooltip = None
+        # False: дальше отработает стандартный обработчик GTK
+        return False
+
+    def _on_tooltip_leave(self, *_):
+        self._tooltip_visible = False
+        return False
+
+
+class ControlLifecycleMixin:
+    """
+    Общие таймеры, состояние muted и очистка для контролов
+
+    Очистка подключена к сигналу destroy: он приходит и при уничтожении
+    родителем со стороны C, минуя Python-переопределение destroy(), которое
+    остаётся лишь быстрым путём для явного вызова.
+    """
+
+    def _init_lifecycle(self):
+        self._deferred_update: Optional[DeferredCall] = None
+        self._notify_source_id: Optional[int] = None
+        self._stream_binding: Optional[StreamBinding] = None
+        self._last_muted: Optional[bool] = None
+        # Виджеты, получающие класс muted; базовые классы уточняют набор
+        self._muted_widgets = (self,)
+        self.connect("destroy", self._on_destroy)
+
+    def _set_muted(self, muted: bool):
+        """Переключить класс muted, только если состояние изменилось"""
+        if muted == self._last_muted:
+            return
+        self._last_muted = muted
+        for widget in self._muted_widgets:
+            if muted:
+                widget.add_style_class("muted")
+            else:
+                widget.remove_style_class("muted")
+
+    def _queue_changed(self, handler: Callable[[], None]):
+        """Схлопнуть серию сигналов "changed" в один вызов handler (trailing edge)"""
+        if self._notify_source_id is None:
+            self._notify_source_id = GLib.timeout_add(
+                CHANGED_COALESCE_MS, self._flush_changed, handler
+            )
+
+    def _flush_changed(self, handler: Callable[[], None]) -> bool:
+        """Выполнить отложенное обновление UI"""
+        self._notify_source_id = None
+        handler()
+        return False
+
+    def cleanup(self):
+        """Очистить таймеры и отвязаться от потока"""
+        if self._deferred_update is not None:
+            self._deferred_update.destroy()
+            self._deferred_update = None
+        if self._notify_source_id is not None:
+            GLib.source_remove(self._notify_source_id)
+            self._notify_source_id = None
+        if self._stream_binding is not None:
+            self._stream_binding.unbind()
+
+    def _on_destroy(self, *_):
+        self.cleanup()
+
+    def destroy(self):
+        """Переопределение destroy для корректной очистки"""
+        self.cleanup()
+        super().destroy()
 
 
-class BaseSlider(Scale):
+class SmoothScrollMixin:
+    """
+    Накопление дробной smooth-прокрутки
+
+    Целая часть смещения применяется сразу, остаток — одним вызовом в idle
+    после пачки событий, чтобы он не переходил в следующий жест.
+    Подклассы реализуют _apply_scroll_delta.
+    """
+
+    def _init_smooth_scroll(self):
+        self._scroll_accum = 0.0
+        self._scroll_flush_id: Optional[int] = None
+
+    def _apply_scroll_delta(self, delta: float):
+        """Применить накопленное смещение прокрутки"""
+        raise NotImplementedError("Subclasses must implement _apply_scroll_delta")
+
+    def _consume_scroll(self, delta: float) -> int:
+        """Накопить дробное смещение и вернуть его целую часть"""
+        self._scroll_accum += delta
+        whole = int(self._scroll_accum)
+        self._scroll_accum -= whole
+        if self._scroll_accum and self._scroll_flush_id is None:
+            self._scroll_flush_id = GLib.idle_add(self._flush_scroll)
+        return whole
+
+    def _flush_scroll(self) -> bool:
+        self._scroll_flush_id = None
+        rest, self._scroll_accum = self._scroll_accum, 0.0
+        if rest:
+            self._apply_scroll_delta(rest)
+        return False
+
+    def cleanup(self):
+        """Очистить таймеры, включая отложенную прокрутку"""
+        super().cleanup()
+        if self._scroll_flush_id is not None:
+            GLib.source_remove(self._scroll_flush_id)
+            self._scroll_flush_id = None
+
+
+class BaseSlider(ControlLifecycleMixin, LazyTooltipMixin, Scale):
     """Базовый класс для слайдеров с debouncing"""
 
     def __init__(
@@ -23,6 +349,7 @@ class BaseSlider(Scale):
         name: str,
         style_class: str,
         debounce_timeout: int = 100,
+        debounced: bool = True,
         **kwargs
     ):
         super().__init__(
@@ -34,9 +361,11 @@ class BaseSlider(Scale):
             **kwargs,
         )
         self.add_style_class(style_class)
+        self._init_lazy_tooltip()
+        self._init_lifecycle()
         self._pending_value: Optional[float] = None
-        self._update_source_id: Optional[int] = None
         self._debounce_timeout = debounce_timeout
+        self._debounced = debounced
         self._updating_from_source = False
 
     def _apply_pending_change(self) -> bool:
@@ -46,22 +375,13 @@ class BaseSlider(Scale):
     def _schedule_update(self, value: float):
         """Запланировать обновление с debouncing"""
         self._pending_value = value
-        if self._update_source_id is not None:
-            GLib.source_remove(self._update_source_id)
-        self._update_source_id = GLib.timeout_add(
-            self._debounce_timeout, self._apply_pending_change
-        )
+        if not self._debounced:
+            self._apply_pending_change()
+            return
+        if self._deferred_update is None:
+            self._deferred_update = DeferredCall(self._apply_pending_change)
+        self._deferred_update.schedule_adaptive(self._debounce_timeout)
 
-    def cleanup(self):
-        """Очистить таймеры и ресурсы"""
-        if self._update_source_id is not None:
-            GLib.source_remove(self._update_source_id)
-            self._update_source_id = None
-
-    def destroy(self):
-        """Переопределение destroy для корректной очистки"""
-        self.cleanup()
-        super().destroy()
 
 
 class VolumeSlider(BaseSlider):
@@ -76,15 +396,15 @@ class VolumeSlider(BaseSlider):
         )
         self.audio = Audio()
         self.audio.connect("notify::speaker", self.on_new_speaker)
-        if self.audio.speaker:
-            self.audio.speaker.connect("changed", self.on_speaker_changed)
+        self._stream_binding = StreamBinding({"changed": self._on_speaker_notify})
+        self._stream_binding.bind(self.audio.speaker)
         self.connect("change-value", self.on_change_value)
         self.on_speaker_changed()
 
     def on_new_speaker(self, *args):
         """Обработчик подключения нового устройства воспроизведения"""
+        self._stream_binding.bind(self.audio.speaker)
         if self.audio.speaker:
-            self.audio.speaker.connect("changed", self.on_speaker_changed)
             self.on_speaker_changed()
 
     def on_change_value(self, widget, scroll, value):
@@ -96,26 +416,27 @@ class VolumeSlider(BaseSlider):
 
     def _apply_pending_change(self) -> bool:
         """Применить изменение громкости"""
-        if self._pending_value is not None and self.audio.speaker:
-            self.audio.speaker.volume = self._pending_value
+        spk = self.audio.speaker
+        if self._pending_value is not None and spk:
+            spk.volume = self._pending_value
         self._pending_value = None
-        self._update_source_id = None
         return False
 
+    def _on_speaker_notify(self, *_):
+        """Сигнал "changed" динамика: обновление UI с coalescing"""
+        self._queue_changed(self.on_speaker_changed)
+
     def on_speaker_changed(self, *_):
         """Обработчик изменения состояния динамика"""
-        if not self.audio.speaker:
+        spk = self.audio.speaker
+        if not spk:
             return
 
         self._updating_from_source = True
-        self.value = self.audio.speaker.volume / 100
+        self.value = spk.volume / 100
         self._updating_from_source = False
 
-        # Обновление стиля muted
-        if self.audio.speaker.muted:
-            self.add_style_class("muted")
-        else:
-            self.remove_style_class("muted")
+        self._set_muted(bool(spk.muted))
 
 
 class MicSlider(BaseSlider):
@@ -126,47 +447,52 @@ class MicSlider(BaseSlider):
             name="control-slider",
             style_class="mic",
             increments=(0.01, 0.1),
-            debounce_timeout=50,  # Быстрее для микрофона
+            debounced=False,  # Мгновенное применение для микрофона
             **kwargs
         )
         self.audio = Audio()
         self.audio.connect("notify::microphone", self.on_new_microphone)
-        if self.audio.microphone:
-            self.audio.microphone.connect("changed", self.on_microphone_changed)
+        self._stream_binding = StreamBinding({"changed": self._on_microphone_notify})
+        self._stream_binding.bind(self.audio.microphone)
         self.connect("change-value", self.on_change_value)
         self.on_microphone_changed()
 
     def on_new_microphone(self, *args):
         """Обработчик подключения нового микрофона"""
+        self._stream_binding.bind(self.audio.microphone)
         if self.audio.microphone:
-            self.audio.microphone.connect("changed", self.on_microphone_changed)
             self.on_microphone_changed()
 
     def on_change_value(self, widget, scroll, value):
         """Обработчик изменения значения слайдера"""
         if self._updating_from_source or not self.audio.microphone:
             return False
-        # Мгновенное применение для микрофона
-        self.audio.microphone.volume = value * 100
+        self._schedule_update(value * 100)
         return False
 
     def _apply_pending_change(self) -> bool:
-        """Не используется для микрофона (мгновенное применение)"""
+        """Применить изменение громкости микрофона"""
+        mic = self.audio.microphone
+        if self._pending_value is not None and mic:
+            mic.volume = self._pending_value
+        self._pending_value = None
         return False
 
+    def _on_microphone_notify(self, *_):
+        """Сигнал "changed" микрофона: обновление UI с coalescing"""
+        self._queue_changed(self.on_microphone_changed)
+
     def on_microphone_changed(self, *_):
         """Обработчик изменения состояния микрофона"""
-        if not self.audio.microphone:
+        mic = self.audio.microphone
+        if not mic:
             return
 
         self._updating_from_source = True
-        self.value = self.audio.microphone.volume / 100
+        self.value = mic.volume / 100
         self._updating_from_source = False
 
-        if self.audio.microphone.muted:
-            self.add_style_class("muted")
-        else:
-            self.remove_style_class("muted")
+        self._set_muted(bool(mic.muted))
 
 
 class BrightnessSlider(BaseSlider):
@@ -200,11 +526,8 @@ class BrightnessSlider(BaseSlider):
     def _apply_pending_change(self) -> bool:
         """Применить изменение яркости"""
         if self._pending_value is not None:
-            value_to_set = self._pending_value
+            BrightnessWriter.get_initial().post(self._pending_value)
             self._pending_value = None
-            if value_to_set != self.client.screen_brightness:
-                self.client.screen_brightness = value_to_set
-        self._update_source_id = None
         return False
 
     def on_brightness_changed(self, client, _):
@@ -216,12 +539,13 @@ class BrightnessSlider(BaseSlider):
 
     def _update_tooltip(self):
         """Обновить tooltip с процентами яркости"""
-        if self.client.max_screen > 0:
-            percentage = int((self.client.screen_brightness / self.client.max_screen) * 100)
-            self.set_tooltip_text(f"{percentage}%")
+        max_screen = self.client.max_screen
+        if max_screen > 0:
+            percentage = int((self.client.screen_brightness / max_screen) * 100)
+            self._set_tooltip(f"{percentage}%")
 
 
-class BaseSmallControl(Box):
+class BaseSmallControl(SmoothScrollMixin, ControlLifecycleMixin, LazyTooltipMixin, Box):
     """Базовый класс для компактных элементов управления с прогресс-баром"""
 
     def __init__(
@@ -233,6 +557,9 @@ class BaseSmallControl(Box):
         **kwargs
     ):
         super().__init__(name=name, **kwargs)
+        self._init_lazy_tooltip()
+        self._init_lifecycle()
+        self._init_smooth_scroll()
         self.progress_bar = CircularProgressBar(
             name=button_name,
             size=28,
@@ -240,7 +567,7 @@ class BaseSmallControl(Box):
             start_angle=150,
             end_angle=390,
         )
-        self.icon_label = Label(
+        self.icon_label = CachedLabel(
             name=f"{button_name.split('-')[-1]}-label",
             markup=icon_markup,
         )
@@ -263,9 +590,9 @@ class BaseSmallControl(Box):
         self.add_events(Gdk.EventMask.SCROLL_MASK | Gdk.EventMask.SMOOTH_SCROLL_MASK)
 
         self._pending_value: Optional[float] = None
-        self._update_source_id: Optional[int] = None
         self._updating_from_source = False
         self._debounce_timeout = 100
+        self._muted_widgets = (self.progress_bar, self.icon_label)
 
     def on_scroll(self, widget, event):
         """Обработчик прокрутки колеса мыши"""
@@ -274,27 +601,14 @@ class BaseSmallControl(Box):
     def _schedule_update(self, new_value: float):
         """Запланировать обновление с debouncing"""
         self._pending_value = new_value
-        if self._update_source_id is not None:
-            GLib.source_remove(self._update_source_id)
-        self._update_source_id = GLib.timeout_add(
-            self._debounce_timeout, self._update_callback
-        )
+        if self._deferred_update is None:
+            self._deferred_update = DeferredCall(self._update_callback)
+        self._deferred_update.schedule_adaptive(self._debounce_timeout)
 
     def _update_callback(self) -> bool:
         """Callback для применения изменений"""
         raise NotImplementedError("Subclasses must implement _update_callback")
 
-    def cleanup(self):
-        """Очистить таймеры"""
-        if self._update_source_id is not None:
-            GLib.source_remove(self._update_source_id)
-            self._update_source_id = None
-
-    def destroy(self):
-        """Переопределение destroy для корректной очистки"""
-        self.cleanup()
-        super().destroy()
-
 
 class BrightnessSmall(BaseSmallControl):
     """Компактный элемент управления яркостью"""
@@ -321,46 +635,36 @@ class BrightnessSmall(BaseSmallControl):
         if self._updating_from_source:  # ← Как в BrightnessSlider
             return
         
-        if self.brightness.max_screen == -1:
+        max_screen = self.brightness.max_screen
+        if max_screen == -1:
             return
 
-        step_size = 5
-        current = self.brightness.screen_brightness
-        new_brightness = None
+        sign = _scroll_sign(event)
+        if not sign:
+            return
 
-        if event.direction == Gdk.ScrollDirection.SMOOTH:
-            if event.delta_y < 0:
-                new_brightness = min(current + step_size, self.brightness.max_screen)
-            elif event.delta_y > 0:
-                new_brightness = max(current - step_size, 0)
-        elif event.direction == Gdk.ScrollDirection.UP:
-            new_brightness = min(current + step_size, self.brightness.max_screen)
-        elif event.direction == Gdk.ScrollDirection.DOWN:
-            new_brightness = max(current - step_size, 0)
-
-        if new_brightness is not None:
-            self._schedule_update(new_brightness)
+        step_size = 5
+        # Быстрые щелчки колеса копятся от отложенного значения
+        pending = self._pending_value
+        current = pending if pending is not None else BrightnessWriter.get_initial().current()
+        self._schedule_update(max(0, min(max_screen, current + sign * step_size)))
 
     def _update_callback(self) -> bool:
         """Применить изменение яркости"""
         if self._pending_value is not None:
-            value_to_set = self._pending_value
+            BrightnessWriter.get_initial().post(self._pending_value)
             self._pending_value = None
-            if value_to_set != self.brightness.screen_brightness:
-                self._updating_from_source = True  # ← ВАЖНО: добавить флаг
-                self.brightness.screen_brightness = value_to_set
-                self._updating_from_source = False
-        self._update_source_id = None
         return False
 
     def on_brightness_changed(self, *args):
         """Обработчик изменения яркости"""
-        if self.brightness.max_screen == -1:
+        max_screen = self.brightness.max_screen
+        if max_screen == -1:
             return
 
         normalized = (
-            self.brightness.screen_brightness / self.brightness.max_screen
-            if self.brightness.max_screen > 0 else 0
+            self.brightness.screen_brightness / max_screen
+            if max_screen > 0 else 0
         )
 
         self._updating_from_source = True  # ← Как в BrightnessSlider
@@ -370,14 +674,11 @@ class BrightnessSmall(BaseSmallControl):
         percentage = int(normalized * 100)
 
         # Обновление иконки в зависимости от уровня яркости
-        if percentage >= 75:
-            self.icon_label.set_markup(icons.brightness_high)
-        elif percentage >= 24:
-            self.icon_label.set_markup(icons.brightness_medium)
-        else:
-            self.icon_label.set_markup(icons.brightness_low)
+        self.icon_label.set_markup(
+            _BRIGHTNESS_ICONS[bisect_right(_BRIGHTNESS_THRESHOLDS, percentage)]
+        )
 
-        self.set_tooltip_text(f"{percentage}%")
+        self._set_tooltip(f"{percentage}%")
 
 
 class VolumeSmall(BaseSmallControl):
@@ -392,17 +693,34 @@ class VolumeSmall(BaseSmallControl):
             on_button_click=self.toggle_mute,
             **kwargs
         )
+        self._icons_set = _ICONS_SPK
         self.audio.connect("notify::speaker", self.on_new_speaker)
-        if self.audio.speaker:
-            self.audio.speaker.connect("changed", self.on_speaker_changed)
+        self._stream_binding = StreamBinding({
+            "changed": self._on_speaker_notify,
+            "notify::icon-name": self._on_icon_name_notify,
+        })
+        self._stream_binding.bind(self.audio.speaker)
+        self._refresh_icons_set()
         self.on_speaker_changed()
 
     def on_new_speaker(self, *args):
         """Обработчик подключения нового устройства"""
+        self._stream_binding.bind(self.audio.speaker)
         if self.audio.speaker:
-            self.audio.speaker.connect("changed", self.on_speaker_changed)
+            self._refresh_icons_set()
             self.on_speaker_changed()
 
+    def _refresh_icons_set(self):
+        """Выбрать набор иконок по типу устройства (меняется только со сменой icon-name)"""
+        spk = self.audio.speaker
+        self._icons_set = (
+            _ICONS_BT if spk and "bluetooth" in spk.icon_name else _ICONS_SPK
+        )
+
+    def _on_icon_name_notify(self, *_):
+        self._refresh_icons_set()
+        self.on_speaker_changed()
+
     def toggle_mute(self, event):
         """Переключить mute"""
         if self.audio.speaker:
@@ -413,55 +731,53 @@ class VolumeSmall(BaseSmallControl):
         if not self.audio.speaker:
             return
 
-        if event.direction == Gdk.ScrollDirection.SMOOTH:
-            if abs(event.delta_y) > 0:
-                self.audio.speaker.volume -= event.delta_y * 5
-            elif abs(event.delta_x) > 0:
-                self.audio.speaker.volume += event.delta_x * 5
+        if event.direction != Gdk.ScrollDirection.SMOOTH:
+            return
+
+        step = self._consume_scroll((event.delta_x - event.delta_y) * 5)
+        if step:
+            self._apply_scroll_delta(step)
+
+    def _apply_scroll_delta(self, delta: float):
+        """Сдвинуть громкость на delta через debouncer"""
+        spk = self.audio.speaker
+        if not spk:
+            return
+        # Пока запись не применена, копим от отложенного значения
+        pending = self._pending_value
+        current = pending if pending is not None else spk.volume
+        self._schedule_update(max(0, min(SCROLL_VOLUME_MAX, current + delta)))
 
     def _update_callback(self) -> bool:
-        """Не используется (мгновенное применение)"""
+        """Применить изменение громкости одной записью"""
+        spk = self.audio.speaker
+        if self._pending_value is not None and spk:
+            spk.volume = self._pending_value
+        self._pending_value = None
         return False
 
+    def _on_speaker_notify(self, *_):
+        """Сигнал "changed" динамика: обновление UI с coalescing"""
+        self._queue_changed(self.on_speaker_changed)
+
     def on_speaker_changed(self, *_):
         """Обработчик изменения состояния динамика"""
-        if not self.audio.speaker:
+        spk = self.audio.speaker
+        if not spk:
             return
+        volume = spk.volume
+        muted = bool(spk.muted)
+        icons_set = self._icons_set
 
-        # Выбор иконок в зависимости от типа устройства
-        if "bluetooth" in self.audio.speaker.icon_name:
-            icons_set = {
-                "high": icons.bluetooth_connected,
-                "medium": icons.bluetooth,
-                "mute": icons.bluetooth_off,
-                "off": icons.bluetooth_disconnected
-            }
-        else:
-            icons_set = {
-                "high": icons.vol_high,
-                "medium": icons.vol_medium,
-                "mute": icons.vol_off,
-                "off": icons.vol_mute
-            }
-
-        self.progress_bar.value = self.audio.speaker.volume / 100
-
-        if self.audio.speaker.muted:
-            self.icon_label.set_markup(icons_set["mute"])
-            self.progress_bar.add_style_class("muted")
-            self.icon_label.add_style_class("muted")
-            self.set_tooltip_text("Muted")
+        self.progress_bar.value = volume / 100
+
+        self._set_muted(muted)
+        if muted:
+            self.icon_label.set_markup(icons_set[_ICON_MUTE])
+            self._set_tooltip("Muted")
         else:
-            self.progress_bar.remove_style_class("muted")
-            self.icon_label.remove_style_class("muted")
-            volume = self.audio.speaker.volume
-            if volume > 74:
-                self.icon_label.set_markup(icons_set["high"])
-            elif volume > 0:
-                self.icon_label.set_markup(icons_set["medium"])
-            else:
-                self.icon_label.set_markup(icons_set["off"])
-            self.set_tooltip_text(f"{round(volume)}%")
+            self.icon_label.set_markup(icons_set[bisect_left(_VOLUME_THRESHOLDS, volume)])
+            self._set_tooltip(f"{round(volume)}%")
 
 
 class MicSmall(BaseSmallControl):
@@ -477,14 +793,14 @@ class MicSmall(BaseSmallControl):
             **kwargs
         )
         self.audio.connect("notify::microphone", self.on_new_microphone)
-        if self.audio.microphone:
-            self.audio.microphone.connect("changed", self.on_microphone_changed)
+        self._stream_binding = StreamBinding({"changed": self._on_microphone_notify})
+        self._stream_binding.bind(self.audio.microphone)
         self.on_microphone_changed()
 
     def on_new_microphone(self, *args):
         """Обработчик подключения нового микрофона"""
+        self._stream_binding.bind(self.audio.microphone)
         if self.audio.microphone:
-            self.audio.microphone.connect("changed", self.on_microphone_changed)
             self.on_microphone_changed()
 
     def toggle_mute(self, event):
@@ -497,39 +813,57 @@ class MicSmall(BaseSmallControl):
         if not self.audio.microphone:
             return
 
-        if event.direction == Gdk.ScrollDirection.SMOOTH:
-            if abs(event.delta_y) > 0:
-                self.audio.microphone.volume -= event.delta_y * 5
-            elif abs(event.delta_x) > 0:
-                self.audio.microphone.volume += event.delta_x * 5
+        if event.direction != Gdk.ScrollDirection.SMOOTH:
+            return
+
+        step = self._consume_scroll((event.delta_x - event.delta_y) * 5)
+        if step:
+            self._apply_scroll_delta(step)
+
+    def _apply_scroll_delta(self, delta: float):
+        """Сдвинуть громкость на delta через debouncer"""
+        mic = self.audio.microphone
+        if not mic:
+            return
+        # Пока запись не применена, копим от отложенного значения
+        pending = self._pending_value
+        current = pending if pending is not None else mic.volume
+        self._schedule_update(max(0, min(SCROLL_VOLUME_MAX, current + delta)))
 
     def _update_callback(self) -> bool:
-        """Не используется (мгновенное применение)"""
+        """Применить изменение громкости одной записью"""
+        mic = self.audio.microphone
+        if self._pending_value is not None and mic:
+            mic.volume = self._pending_value
+        self._pending_value = None
         return False
 
+    def _on_microphone_notify(self, *_):
+        """Сигнал "changed" микрофона: обновление UI с coalescing"""
+        self._queue_changed(self.on_microphone_changed)
+
     def on_microphone_changed(self, *_):
         """Обработчик изменения состояния микрофона"""
-        if not self.audio.microphone:
+        mic = self.audio.microphone
+        if not mic:
             return
 
-        if self.audio.microphone.muted:
+        muted = bool(mic.muted)
+        self._set_muted(muted)
+        if muted:
             self.icon_label.set_markup(icons.mic_mute)
-            self.progress_bar.add_style_class("muted")
-            self.icon_label.add_style_class("muted")
-            self.set_tooltip_text("Muted")
+            self._set_tooltip("Muted")
         else:
-            self.progress_bar.remove_style_class("muted")
-            self.icon_label.remove_style_class("muted")
-            self.progress_bar.value = self.audio.microphone.volume / 100
-            volume = self.audio.microphone.volume
+            volume = mic.volume
+            self.progress_bar.value = volume / 100
             if volume >= 1:
                 self.icon_label.set_markup(icons.mic)
             else:
                 self.icon_label.set_markup(icons.mic_mute)
-            self.set_tooltip_text(f"{round(volume)}%")
+            self._set_tooltip(f"{round(volume)}%")
 
 
-class BaseIcon(Box):
+class BaseIcon(SmoothScrollMixin, ControlLifecycleMixin, LazyTooltipMixin, Box):
     """Базовый класс для иконок с прокруткой"""
 
     def __init__(
@@ -541,7 +875,10 @@ class BaseIcon(Box):
         **kwargs
     ):
         super().__init__(name=name, **kwargs)
-        self.icon_label = Label(
+        self._init_lazy_tooltip()
+        self._init_lifecycle()
+        self._init_smooth_scroll()
+        self.icon_label = CachedLabel(
             name=label_name,
             markup=icon_markup,
             h_align="center",
@@ -576,54 +913,35 @@ class BaseIcon(Box):
         self.add_events(Gdk.EventMask.SCROLL_MASK | Gdk.EventMask.SMOOTH_SCROLL_MASK)
 
         self._pending_value: Optional[float] = None
-        self._update_source_id: Optional[int] = None
         self._updating_from_source = False
+        self._debounce_timeout = 100
+        self._muted_widgets = (self, self.icon_label)
 
     def on_scroll(self, widget, event):
         """Обработчик прокрутки"""
         raise NotImplementedError("Subclasses must implement on_scroll")
 
-    def _handle_scroll_event(
-        self,
-        event,
-        current_value: float,
-        max_value: float = 100,
-        step: int = 5
-    ) -> Optional[float]:
-        """Общая логика обработки scroll события"""
+    def _handle_scroll_event(self, event, step: int = 5):
+        """Общая логика обработки scroll события: step за единицу прокрутки"""
         if event.direction == Gdk.ScrollDirection.SMOOTH:
-            if event.delta_y < 0:
-                return min(current_value + step, max_value)
-            elif event.delta_y > 0:
-                return max(current_value - step, 0)
+            # Тачпад шлёт дробные дельты: целые шаги сразу, остаток — в idle
+            delta = self._consume_scroll(-event.delta_y * step)
         else:
-            if event.direction == Gdk.ScrollDirection.UP:
-                return min(current_value + step, max_value)
-            elif event.direction == Gdk.ScrollDirection.DOWN:
-                return max(current_value - step, 0)
-        return None
+            delta = _scroll_sign(event) * step
+        if delta:
+            self._apply_scroll_delta(delta)
 
     def _schedule_update(self, new_value: float):
         """Запланировать обновление"""
         self._pending_value = new_value
-        if self._update_source_id is not None:
-            GLib.source_remove(self._update_source_id)
-        self._update_source_id = GLib.timeout_add(100, self._update_callback)
+        if self._deferred_update is None:
+            self._deferred_update = DeferredCall(self._update_callback)
+        self._deferred_update.schedule_adaptive(self._debounce_timeout)
 
     def _update_callback(self) -> bool:
         """Callback для применения изменений"""
         raise NotImplementedError("Subclasses must implement _update_callback")
 
-    def cleanup(self):
-        """Очистить таймеры"""
-        if self._update_source_id is not None:
-            GLib.source_remove(self._update_source_id)
-            self._update_source_id = None
-
-    def destroy(self):
-        """Переопределение destroy для корректной очистки"""
-        self.cleanup()
-        super().destroy()
 
 
 class BrightnessIcon(BaseIcon):
@@ -649,42 +967,41 @@ class BrightnessIcon(BaseIcon):
         """Обработчик прокрутки для изменения яркости"""
         if self.brightness.max_screen == -1:
             return
+        self._handle_scroll_event(event)
 
-        new_value = self._handle_scroll_event(
-            event,
-            self.brightness.screen_brightness,
-            self.brightness.max_screen
-        )
-        if new_value is not None:
-            self._schedule_update(new_value)
+    def _apply_scroll_delta(self, delta: float):
+        """Сдвинуть яркость на delta через debouncer"""
+        max_screen = self.brightness.max_screen
+        if max_screen == -1:
+            return
+        # Пока запись не применена, копим от отложенного значения
+        pending = self._pending_value
+        current = pending if pending is not None else BrightnessWriter.get_initial().current()
+        self._schedule_update(max(0, min(max_screen, current + delta)))
 
     def _update_callback(self) -> bool:
         """Применить изменение яркости"""
-        if (self._pending_value is not None
-                and self._pending_value != self.brightness.screen_brightness):
-            self.brightness.screen_brightness = self._pending_value
+        if self._pending_value is not None:
+            BrightnessWriter.get_initial().post(self._pending_value)
         self._pending_value = None
-        self._update_source_id = None
         return False
 
     def on_brightness_changed(self, *args):
         """Обработчик изменения яркости"""
-        if self.brightness.max_screen == -1:
+        max_screen = self.brightness.max_screen
+        if max_screen == -1:
             return
 
         self._updating_from_source = True
-        normalized = self.brightness.screen_brightness / self.brightness.max_screen
+        normalized = self.brightness.screen_brightness / max_screen
         percentage = int(normalized * 100)
 
         # Обновление иконки
-        if percentage >= 75:
-            self.icon_label.set_markup(icons.brightness_high)
-        elif percentage >= 24:
-            self.icon_label.set_markup(icons.brightness_medium)
-        else:
-            self.icon_label.set_markup(icons.brightness_low)
+        self.icon_label.set_markup(
+            _BRIGHTNESS_ICONS[bisect_right(_BRIGHTNESS_THRESHOLDS, percentage)]
+        )
 
-        self.set_tooltip_text(f"{percentage}%")
+        self._set_tooltip(f"{percentage}%")
         self._updating_from_source = False
 
 
@@ -700,98 +1017,108 @@ class VolumeIcon(BaseIcon):
             on_button_click=self.toggle_mute,
             **kwargs
         )
-        self._periodic_update_source_id: Optional[int] = None
+        self._muted_widgets = (self, self.icon_label, self.button)
+        self._pending_style: Optional[tuple[bool, str]] = None
+        self._style_source_id: Optional[int] = None
         self.audio.connect("notify::speaker", self.on_new_speaker)
-        if self.audio.speaker:
-            self.audio.speaker.connect("changed", self.on_speaker_changed)
-            self._periodic_update_source_id = GLib.timeout_add_seconds(
-                2, self.update_device_icon
-            )
+        self._stream_binding = StreamBinding({
+            "changed": self._on_speaker_notify,
+            "notify::icon-name": self._on_icon_name_notify,
+        })
+        self._stream_binding.bind(self.audio.speaker)
         self.on_speaker_changed()
 
     def on_scroll(self, widget, event):
         """Обработчик прокрутки для изменения громкости"""
         if not self.audio.speaker:
             return
+        self._handle_scroll_event(event)
 
-        new_value = self._handle_scroll_event(event, self.audio.speaker.volume)
-        if new_value is not None:
-            self._schedule_update(new_value)
+    def _apply_scroll_delta(self, delta: float):
+        """Сдвинуть громкость на delta через debouncer"""
+        spk = self.audio.speaker
+        if not spk:
+            return
+        # Пока запись не применена, копим от отложенного значения
+        pending = self._pending_value
+        current = pending if pending is not None else spk.volume
+        self._schedule_update(max(0, min(100, current + delta)))
 
     def _update_callback(self) -> bool:
         """Применить изменение громкости"""
+        spk = self.audio.speaker
         if (self._pending_value is not None
-                and self.audio.speaker
-                and self._pending_value != self.audio.speaker.volume):
-            self.audio.speaker.volume = self._pending_value
+                and spk
+                and self._pending_value != spk.volume):
+            spk.volume = self._pending_value
         self._pending_value = None
-        self._update_source_id = None
         return False
 
     def on_new_speaker(self, *args):
         """Обработчик подключения нового устройства"""
+        self._stream_binding.bind(self.audio.speaker)
         if self.audio.speaker:
-            self.audio.speaker.connect("changed", self.on_speaker_changed)
             self.on_speaker_changed()
 
+    def _on_icon_name_notify(self, *_):
+        """Смена типа устройства (наушники, bluetooth и т.п.)"""
+        self.update_device_icon()
+
     def toggle_mute(self, event):
         """Переключить mute"""
         if self.audio.speaker:
             self.audio.speaker.muted = not self.audio.speaker.muted
 
+    def _on_speaker_notify(self, *_):
+        """Сигнал "changed" динамика: обновление UI с coalescing"""
+        self._queue_changed(self.on_speaker_changed)
+
     def on_speaker_changed(self, *_):
         """Обработчик изменения состояния динамика"""
-        if not self.audio.speaker:
+        spk = self.audio.speaker
+        if not spk:
             self.icon_label.set_markup(icons.vol_off)
-            self._remove_muted_styles()
-            self.set_tooltip_text("No audio device")
+            self._queue_style_apply(False, "No audio device")
             return
 
-        if self.audio.speaker.muted:
+        if spk.muted:
             self.icon_label.set_markup(icons.headphones)
-            self._apply_muted_styles()
-            self.set_tooltip_text("Muted")
+            self._queue_style_apply(True, "Muted")
         else:
-            self._remove_muted_styles()
             self.update_device_icon()
-            self.set_tooltip_text(f"{round(self.audio.speaker.volume)}%")
-
-    def _apply_muted_styles(self):
-        """Применить стили для muted состояния"""
-        self.add_style_class("muted")
-        self.icon_label.add_style_class("muted")
-        self.button.add_style_class("muted")
-
-    def _remove_muted_styles(self):
-        """Удалить стили muted состояния"""
-        self.remove_style_class("muted")
-        self.icon_label.remove_style_class("muted")
-        self.button.remove_style_class("muted")
+            self._queue_style_apply(False, f"{round(spk.volume)}%")
+
+    def _queue_style_apply(self, muted: bool, tooltip: str):
+        """Отложить класс muted и tooltip до idle, применяя последнее состояние"""
+        self._pending_style = (muted, tooltip)
+        if self._style_source_id is None:
+            self._style_source_id = GLib.idle_add(
+                self._flush_style, priority=GLib.PRIORITY_DEFAULT_IDLE
+            )
 
-    def update_device_icon(self) -> bool:
+    def _flush_style(self) -> bool:
+        """Применить накопленные изменения стиля одним проходом"""
+        self._style_source_id = None
+        if self._pending_style is not None:
+            muted, tooltip = self._pending_style
+            self._pending_style = None
+            self._set_muted(muted)
+            self._set_tooltip(tooltip)
+        return GLib.SOURCE_REMOVE
+
+    def update_device_icon(self):
         """Обновить иконку в зависимости от типа устройства"""
-        if not self.audio.speaker or self.audio.speaker.muted:
-            return True
-
-        try:
+        spk = self.audio.speaker
+        if spk and not spk.muted:
             # Можно расширить для других типов устройств
-            icon = icons.headphones  # По умолчанию
-            self.icon_label.set_markup(icon)
-        except AttributeError:
             self.icon_label.set_markup(icons.headphones)
-        return True
 
     def cleanup(self):
-        """Очистить все таймеры"""
+        """Очистить таймеры и отложенное применение стиля"""
         super().cleanup()
-        if self._periodic_update_source_id is not None:
-            GLib.source_remove(self._periodic_update_source_id)
-            self._periodic_update_source_id = None
-
-    def destroy(self):
-        """Переопределение destroy"""
-        self.cleanup()
-        super().destroy()
+        if self._style_source_id is not None:
+            GLib.source_remove(self._style_source_id)
+            self._style_source_id = None
 
 
 class MicIcon(BaseIcon):
@@ -807,33 +1134,40 @@ class MicIcon(BaseIcon):
             **kwargs
         )
         self.audio.connect("notify::microphone", self.on_new_microphone)
-        if self.audio.microphone:
-            self.audio.microphone.connect("changed", self.on_microphone_changed)
+        self._stream_binding = StreamBinding({"changed": self._on_microphone_notify})
+        self._stream_binding.bind(self.audio.microphone)
         self.on_microphone_changed()
 
     def on_scroll(self, widget, event):
         """Обработчик прокрутки для изменения громкости"""
         if not self.audio.microphone:
             return
+        self._handle_scroll_event(event)
 
-        new_value = self._handle_scroll_event(event, self.audio.microphone.volume)
-        if new_value is not None:
-            self._schedule_update(new_value)
+    def _apply_scroll_delta(self, delta: float):
+        """Сдвинуть громкость на delta через debouncer"""
+        mic = self.audio.microphone
+        if not mic:
+            return
+        # Пока запись не применена, копим от отложенного значения
+        pending = self._pending_value
+        current = pending if pending is not None else mic.volume
+        self._schedule_update(max(0, min(100, current + delta)))
 
     def _update_callback(self) -> bool:
         """Применить изменение громкости"""
+        mic = self.audio.microphone
         if (self._pending_value is not None
-                and self.audio.microphone
-                and self._pending_value != self.audio.microphone.volume):
-            self.audio.microphone.volume = self._pending_value
+                and mic
+                and self._pending_value != mic.volume):
+            mic.volume = self._pending_value
         self._pending_value = None
-        self._update_source_id = None
         return False
 
     def on_new_microphone(self, *args):
         """Обработчик подключения нового микрофона"""
+        self._stream_binding.bind(self.audio.microphone)
         if self.audio.microphone:
-            self.audio.microphone.connect("changed", self.on_microphone_changed)
             self.on_microphone_changed()
 
     def toggle_mute(self, event):
@@ -841,71 +1175,69 @@ class MicIcon(BaseIcon):
         if self.audio.microphone:
             self.audio.microphone.muted = not self.audio.microphone.muted
 
+    def _on_microphone_notify(self, *_):
+        """Сигнал "changed" микрофона: обновление UI с coalescing"""
+        self._queue_changed(self.on_microphone_changed)
+
     def on_microphone_changed(self, *_):
         """Обработчик изменения состояния микрофона"""
-        if not self.audio.microphone:
+        mic = self.audio.microphone
+        if not mic:
             return
 
-        if self.audio.microphone.muted:
+        muted = bool(mic.muted)
+        self._set_muted(muted)
+        if muted:
             self.icon_label.set_markup(icons.mic_mute)
-            self.add_style_class("muted")
-            self.icon_label.add_style_class("muted")
-            self.set_tooltip_text("Muted")
+            self._set_tooltip("Muted")
         else:
-            self.remove_style_class("muted")
-            self.icon_label.remove_style_class("muted")
-            volume = self.audio.microphone.volume
+            volume = mic.volume
             if volume >= 1:
                 self.icon_label.set_markup(icons.mic)
             else:
                 self.icon_label.set_markup(icons.mic_mute)
-            self.set_tooltip_text(f"{round(volume)}%")
+            self._set_tooltip(f"{round(volume)}%")
 
 
 class ControlSliders(Box):
     """Контейнер со слайдерами управления"""
 
     def __init__(self, **kwargs):
+        # Строки собираются заранее и передаются в конструктор целиком
+        rows = []
+        if _has_brightness():
+            rows.append(self._make_row(BrightnessIcon(), BrightnessSlider()))
+        rows.append(self._make_row(VolumeIcon(), VolumeSlider()))
+        rows.append(self._make_row(MicIcon(), MicSlider()))
+
         super().__init__(
             name="control-sliders",
             orientation="h",
             spacing=8,
+            children=rows,
             **kwargs,
         )
+        # show_all выполняет внешний контейнер (Dashboard)
 
-        # Добавляем яркость если доступна
-        brightness = Brightness.get_initial()
-        if brightness.screen_brightness != -1:
-            brightness_row = Box(
-                orientation="h", spacing=0, h_expand=True, h_align="fill"
-            )
-            brightness_row.add(BrightnessIcon())
-            brightness_row.add(BrightnessSlider())
-            self.add(brightness_row)
-
-        # Добавляем громкость
-        volume_row = Box(orientation="h", spacing=0, h_expand=True, h_align="fill")
-        volume_row.add(VolumeIcon())
-        volume_row.add(VolumeSlider())
-        self.add(volume_row)
-
-        # Добавляем микрофон
-        mic_row = Box(orientation="h", spacing=0, h_expand=True, h_align="fill")
-        mic_row.add(MicIcon())
-        mic_row.add(MicSlider())
-        self.add(mic_row)
-
-        self.show_all()
+    @staticmethod
+    def _make_row(icon: Box, slider: Scale) -> Box:
+        """Строка «иконка + слайдер»"""
+        return Box(
+            orientation="h",
+            spacing=0,
+            h_expand=True,
+            h_align="fill",
+            children=[icon, slider],
+        )
 
 
 class ControlSmall(Box):
     """Компактный контейнер с элементами управления"""
 
     def __init__(self, **kwargs):
-        brightness = Brightness.get_initial()
         children = []
-        
-        if brightness.screen_brightness != -1:
+
+        if _has_brightness():
             children.append(BrightnessSmall())
         children.extend([VolumeSmall(), MicSmall()])
 
@@ -914,6 +1246,7 @@ class ControlSmall(Box):
             orientation="h" if not data.VERTICAL else "v",
             spacing=4,
             children=children,
+            visible=True,
+            all_visible=True,
             **kwargs,
         )
-        self.show_all()
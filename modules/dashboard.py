@@ -3,7 +3,7 @@ import gi
 gi.require_version("Gtk", "3.0")
 gi.require_version("GdkPixbuf", "2.0")
 
-from gi.repository import Gdk, GdkPixbuf, GLib, Gtk
+from gi.repository import Gdk, GdkPixbuf, Gtk
 
 from fabric.utils import get_relative_path
 from fabric.widgets.box import Box
@@ -20,6 +20,29 @@ from modules.pins import Pins
 from modules.wallpapers import WallpaperSelector
 from modules.widgets import Widgets
 
+# Разделы, создаваемые при первом показе: имя → фабрика
+LAZY_SECTIONS = {
+    "pins": Pins,
+    "kanban": Kanban,
+    "wallpapers": WallpaperSelector,
+    "mixer": Mixer,
+}
+
+# Порядок вкладок в стеке (Ctrl+Tab / Ctrl+Shift+Tab)
+PAGE_ORDER = ("widgets", *LAZY_SECTIONS)
+
+# Анимация смены страниц; на вертикальной панели отключена
+STACK_TRANSITION_MS = 200
+
+# Кнопки свитчера: имя → (заголовок, иконка для вертикальной панели)
+_SWITCHER_PAGES = {
+    "widgets": ("Widgets", icons.widgets),
+    "pins": ("Pins", icons.pins),
+    "kanban": ("Kanban", icons.kanban),
+    "wallpapers": ("Wallpapers", icons.wallpapers),
+    "mixer": ("Mixer", icons.speaker),
+}
+
 
 class Dashboard(Box):
     def __init__(self, notch, **kwargs):
@@ -37,18 +60,20 @@ class Dashboard(Box):
 
         self.notch = notch
 
-        # Основные разделы
+        # Основные разделы: widgets нужен notch сразу, остальные — по требованию
         self.widgets = Widgets(notch=self.notch)
-        self.pins = Pins()
-        self.kanban = Kanban()
-        self.wallpapers = WallpaperSelector()
-        self.mixer = Mixer()
+        self._sections = {"widgets": self.widgets}
+        # Контейнеры-заглушки в стеке, куда кладётся созданный раздел
+        self._holders = {
+            name: Box(orientation="v", h_expand=True, v_expand=True)
+            for name in LAZY_SECTIONS
+        }
 
         # Стек основного содержимого
         self.stack = Stack(
             name="stack",
-            transition_type="slide-left-right",
-            transition_duration=500,
+            transition_type="none" if data.VERTICAL else "slide-left-right",
+            transition_duration=0 if data.VERTICAL else STACK_TRANSITION_MS,
             v_expand=True,
             v_align="fill",
             h_expand=True,
@@ -56,151 +81,176 @@ class Dashboard(Box):
         )
         self.stack.set_homogeneous(False)
 
-        # Свитчер вкладок
-        self.switcher = Gtk.StackSwitcher(
-            name="switcher",
-            spacing=8,
-        )
-
         # Добавляем страницы в стек
-        self.stack.add_titled(self.widgets, "widgets", "Widgets")
-        self.stack.add_titled(self.pins, "pins", "Pins")
-        self.stack.add_titled(self.kanban, "kanban", "Kanban")
-        self.stack.add_titled(self.wallpapers, "wallpapers", "Wallpapers")
-        self.stack.add_titled(self.mixer, "mixer", "Mixer")
-
-        # Привязываем свитчер к стеку
-        self.switcher.set_stack(self.stack)
-        self.switcher.set_hexpand(True)
-        self.switcher.set_homogeneous(True)
-        self.switcher.set_can_focus(True)
+        self.stack.add_named(self.widgets, "widgets")
+        self._current_idx = 0
+        for name in LAZY_SECTIONS:
+            self.stack.add_named(self._holders[name], name)
+
+        # Свитчер вкладок: кнопки по именам страниц, сразу с нужной подписью
+        self.switcher = self._build_switcher()
+
+        # Действия при входе на страницу по её имени
+        self._on_enter = {"wallpapers": self._reset_wallpaper_search}
 
         # Реакция на смену видимого ребёнка (например, авто‑фокус поиска обоев)
-        self.stack.connect("notify::visible-child", self.on_visible_child_changed)
+        self._visible_child_handler = self.stack.connect(
+            "notify::visible-child", self.on_visible_child_changed
+        )
 
         # Компоновка
-        self.add(self.switcher)
-        self.add(self.stack)
-
-        # Для вертикальной панели — заменить текст свитчера иконками
-        if (
-            data.PANEL_THEME == "Panel"
-            and (
-                data.BAR_POSITION in ["Left", "Right"]
-                or data.PANEL_POSITION in ["Start", "End"]
-            )
-        ):
-            GLib.idle_add(self._setup_switcher_icons)
+        self.children = [self.switcher, self.stack]
 
-        # Закрытие по правому клику в свободном месте
-        self.connect("button-release-event", self._on_button_release)
+        # Закрытие по правому клику в свободном месте; жест слушает только
+        # правую кнопку, левые клики (слайдеры и т.п.) в Python не попадают
+        self._close_gesture = Gtk.GestureMultiPress.new(self)
+        self._close_gesture.set_button(3)
+        self._close_gesture.connect("released", self._on_close_gesture_released)
 
         self.show_all()
 
-        # Удобная мапа секций по имени
-        self._sections = {
-            "widgets": self.widgets,
-            "pins": self.pins,
-            "kanban": self.kanban,
-            "wallpapers": self.wallpapers,
-            "mixer": self.mixer,
-        }
-
     # -----------------------
-    # Внутренние методы
+    # Ленивые разделы
     # -----------------------
 
-    def _setup_switcher_icons(self):
-        icon_details_map = {
-            "Widgets": {"icon": icons.widgets, "name": "widgets"},
-            "Pins": {"icon": icons.pins, "name": "pins"},
-            "Kanban": {"icon": icons.kanban, "name": "kanban"},
-            "Wallpapers": {"icon": icons.wallpapers, "name": "wallpapers"},
-            "Mixer": {"icon": icons.speaker, "name": "mixer"},
-        }
-
-        for btn in self.switcher.get_children():
-            if not isinstance(btn, Gtk.ToggleButton):
-                continue
-
-            original_label = None
-            for child in btn.get_children():
-                if isinstance(child, Gtk.Label):
-                    original_label = child
-                    break
+    @property
+    def pins(self) -> Pins:
+        return self._get_section("pins")
+
+    @property
+    def kanban(self) -> Kanban:
+        return self._get_section("kanban")
+
+    @property
+    def wallpapers(self) -> WallpaperSelector:
+        return self._get_section("wallpapers")
+
+    @property
+    def mixer(self) -> Mixer:
+        return self._get_section("mixer")
+
+    def _get_section(self, name: str):
+        """Раздел по имени; создаётся при первом обращении"""
+        section = self._sections.get(name)
+        if section is None:
+            section = LAZY_SECTIONS[name]()
+            self._sections[name] = section
+            holder = self._holders[name]
+            holder.pack_start(section, True, True, 0)
+            holder.show_all()
+        return section
 
-            if not original_label:
-                continue
-
-            label_text = original_label.get_text()
-            details = icon_details_map.get(label_text)
-            if not details:
-                continue
-
-            icon_markup = details["icon"]
-            css_name_suffix = details["name"]
-
-            btn.remove(original_label)
-
-            new_icon_label = Label(
-                name=f"switcher-icon-{css_name_suffix}",
-                markup=icon_markup,
-            )
-            btn.add(new_icon_label)
-            new_icon_label.show_all()
+    # -----------------------
+    # Внутренние методы
+    # -----------------------
 
-        return GLib.SOURCE_REMOVE
+    def _build_switcher(self) -> Box:
+        """Свитчер из ToggleButton'ов, связанных со страницами по имени"""
+        # Для вертикальной панели — иконки вместо текста
+        use_icons = data.PANEL_THEME == "Panel" and (
+            data.BAR_POSITION in ["Left", "Right"]
+            or data.PANEL_POSITION in ["Start", "End"]
+        )
 
-    def _on_button_release(self, widget, event):
-        # Закрываем дашборд только по правой кнопке и если есть notch
-        if event.button == 3 and self.notch is not None:
+        switcher = Box(name="switcher", spacing=8, h_expand=True)
+        switcher.get_style_context().add_class("stack-switcher")
+        switcher.set_homogeneous(True)
+        switcher.set_can_focus(True)
+
+        self._switcher_buttons = {}
+        self._syncing_switcher = False
+        for name in PAGE_ORDER:
+            title, icon_markup = _SWITCHER_PAGES[name]
+            if use_icons:
+                label = Label(name=f"switcher-icon-{name}", markup=icon_markup)
+            else:
+                label = Label(label=title)
+            button = Gtk.ToggleButton()
+            button.add(label)
+            button.set_active(name == PAGE_ORDER[self._current_idx])
+            button.connect("toggled", self._on_switcher_toggled, name)
+            self._switcher_buttons[name] = button
+            switcher.add(button)
+        return switcher
+
+    def _on_switcher_toggled(self, button, name: str):
+        if self._syncing_switcher:
+            return
+        if button.get_active():
+            self.stack.set_visible_child_name(name)
+        elif self.stack.get_visible_child_name() == name:
+            # Как у StackSwitcher: активную вкладку нельзя «отжать»
+            self._syncing_switcher = True
+            button.set_active(True)
+            self._syncing_switcher = False
+
+    def _sync_switcher(self, name: str):
+        """Отметить кнопку видимой страницы"""
+        self._syncing_switcher = True
+        for button_name, button in self._switcher_buttons.items():
+            button.set_active(button_name == name)
+        self._syncing_switcher = False
+
+    def _on_close_gesture_released(self, gesture, n_press, x, y):
+        if self.notch is not None:
             self.notch.close_notch()
-            return True
-        return False
 
     # -----------------------
     # Навигация по стеку
     # -----------------------
 
     def go_to_next_child(self):
-        children = self.stack.get_children()
-        if not children:
-            return
-        current_index = self.get_current_index(children)
-        # если -1 (ничего не видно) — начинаем с 0
-        if current_index == -1:
-            self.stack.set_visible_child(children[0])
-            return
-        next_index = (current_index + 1) % len(children)
-        self.stack.set_visible_child(children[next_index])
+        next_index = (self._current_idx + 1) % len(PAGE_ORDER)
+        self._set_visible_silently(PAGE_ORDER[next_index])
 
     def go_to_previous_child(self):
-        children = self.stack.get_children()
-        if not children:
-            return
-        current_index = self.get_current_index(children)
-        if current_index == -1:
-            self.stack.set_visible_child(children[-1])
-            return
-        previous_index = (current_index - 1) % len(children)
-        self.stack.set_visible_child(children[previous_index])
-
-    def get_current_index(self, children):
-        current_child = self.stack.get_visible_child()
+        previous_index = (self._current_idx - 1) % len(PAGE_ORDER)
+        self._set_visible_silently(PAGE_ORDER[previous_index])
+
+    def _set_visible_silently(self, name: str):
+        """
+        Перелистывание без хуков входа на страницу: при проходе через
+        обои по Ctrl+Tab поиск не сбрасывается и фокус не перехватывается
+        """
+        self.stack.handler_block(self._visible_child_handler)
         try:
-            return children.index(current_child)
-        except ValueError:
-            return -1
+            self.stack.set_visible_child_name(name)
+        finally:
+            self.stack.handler_unblock(self._visible_child_handler)
+        self._on_page_shown(name)
+
+    def _on_page_shown(self, name: str):
+        """Индекс, свитчер и ленивое создание для видимой страницы"""
+        if name in PAGE_ORDER:
+            self._current_idx = PAGE_ORDER.index(name)
+            self._sync_switcher(name)
+        if name in LAZY_SECTIONS:
+            self._get_section(name)
 
     def on_visible_child_changed(self, stack, param):
-        visible = stack.get_visible_child()
-        if visible is self.wallpapers:
-            # Сброс поиска и фокус на поле
-            self.wallpapers.search_entry.set_text("")
-            self.wallpapers.search_entry.grab_focus()
+        name = stack.get_visible_child_name()
+        self._on_page_shown(name)
+        on_enter = self._on_enter.get(name)
+        if on_enter is not None:
+            on_enter()
+
+    def _reset_wallpaper_search(self):
+        """Сброс поиска и фокус на поле"""
+        self.wallpapers.search_entry.set_text("")
+        self.wallpapers.search_entry.grab_focus()
+
+    def get_visible_section_name(self) -> str:
+        """Имя видимого раздела ('widgets', 'pins', ...)"""
+        return self.stack.get_visible_child_name()
 
     def go_to_section(self, section_name: str):
         """Навигация к конкретному разделу по имени ('widgets', 'pins', ...)."""
-        widget = self._sections.get(section_name)
-        if widget is not None:
-            self.stack.set_visible_child(widget)
+        if section_name in LAZY_SECTIONS and section_name not in self._sections:
+            # Первый показ: раздел создаётся заранее и открывается без анимации,
+            # чтобы не анимировать ещё не отрисованное содержимое
+            self._get_section(section_name)
+            self.stack.set_visible_child_full(
+                section_name, Gtk.StackTransitionType.NONE
+            )
+        elif section_name == "widgets" or section_name in LAZY_SECTIONS:
+            self.stack.set_visible_child_name(section_name)
@@ -1,10 +1,14 @@
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
 from typing import Optional, Dict, Any, List, Tuple
 import json
 import logging
+import os
+import re
 import cairo
 
 from fabric.hyprland.widgets import get_hyprland_connection
-from fabric.utils import (exec_shell_command, exec_shell_command_async,
+from fabric.utils import (exec_shell_command_async,
                          get_relative_path, idle_add, remove_handler)
 from fabric.utils.helpers import get_desktop_applications
 from fabric.widgets.box import Box
@@ -12,19 +16,20 @@ from fabric.widgets.button import Button
 from fabric.widgets.eventbox import EventBox
 from fabric.widgets.image import Image
 from fabric.widgets.revealer import Revealer
-from gi.repository import Gdk, GLib, Gtk
+from gi.repository import Gdk, GdkPixbuf, Gio, GLib, Gtk
 
 import config.data as data
 from modules.corners import MyCorner
+from utils.functions import write_file_atomic
 from utils.icon_resolver import IconResolver
 from widgets.wayland import WaylandWindow as Window
 
 
 # Константы
-CONFIG_CHECK_INTERVAL = 2000  # ms
 OCCLUSION_CHECK_INTERVAL = 500  # ms
 HIDE_DELAY = 250  # ms
 UPDATE_DOCK_DELAY = 250  # ms
+UPDATE_COALESCE_DELAY = 50  # ms, склейка пачек openwindow/closewindow
 
 # Размеры
 INTEGRATED_ICON_SIZE = 20
@@ -34,6 +39,22 @@ HOVER_ACTIVATOR_SIZE = 1
 # Пути
 DOCK_CONFIG_PATH = "../config/dock.json"
 
+# Служебные суффиксы классов окон (foo.bin, foo-gtk, ...)
+_SUFFIXES = (".bin", ".exe", ".so", "-bin", "-gtk")
+
+# Разделители токенов для индекса приложений
+_TOKEN_SPLIT_RE = re.compile(r"[/\-_\s.]+")
+
+# LRU кэш иконок (идентификатор, размер) → pixbuf, общий для всех dock
+ICON_CACHE_SIZE = 256
+_ICON_CACHE: "OrderedDict[Tuple[str, int], GdkPixbuf.Pixbuf]" = OrderedDict()
+
+# Цели drag-and-drop, общие для view и всех кнопок
+_DND_TARGETS = [Gtk.TargetEntry.new("text/plain", Gtk.TargetFlags.SAME_APP, 0)]
+
+# Маркер «нет в кэше» (None — допустимый закэшированный результат)
+_MISSING = object()
+
 # Отступы для различных позиций бара
 BAR_MARGINS = {
     "Top": "-8px 0px 0px 0px",
@@ -89,12 +110,162 @@ class DockOrientation:
         return (HOVER_ACTIVATOR_SIZE, -1)
 
 
+@lru_cache(maxsize=512)
+def _normalize_class_name(class_name: str) -> str:
+    """Нормализовать класс окна: нижний регистр без служебного суффикса"""
+    if not class_name:
+        return ""
+    normalized = class_name.lower()
+    # Обычный случай — суффикса нет: один вызов endswith с кортежем
+    if not normalized.endswith(_SUFFIXES):
+        return normalized
+    for suffix in _SUFFIXES:
+        if normalized.endswith(suffix):
+            return normalized[:-len(suffix)]
+    return normalized
+
+
+def _annotate_app(app: Any):
+    """Сохранить на приложении поля в нижнем регистре (один раз при сборке каталога)"""
+    executable = (app.executable or "").lower()
+    command_line = (app.command_line or "").lower()
+    cmd_parts = command_line.split()
+    app._lc_name = (app.name or "").lower()
+    app._lc_display = (app.display_name or "").lower()
+    app._lc_window_class = (app.window_class or "").lower()
+    app._lc_executable = executable
+    app._lc_command_line = command_line
+    app._lc_exec_basename = executable.rsplit('/', 1)[-1]
+    app._lc_cmd_basename = cmd_parts[0].rsplit('/', 1)[-1] if cmd_parts else ""
+
+
+def _app_contains(app: Any, normalized_id: str) -> bool:
+    """Входит ли normalized_id подстрокой в одно из полей приложения"""
+    return any(
+        field and normalized_id in field
+        for field in (
+            app._lc_name,
+            app._lc_display,
+            app._lc_window_class,
+            app._lc_executable,
+            app._lc_command_line,
+        )
+    )
+
+
+class _AppCatalog:
+    """
+    Общий для всех dock кэш .desktop приложений и карт идентификаторов
+
+    Пересобирается только когда меняется mtime каталогов applications
+    """
+
+    _apps: List[Any] = []
+    _identifiers: Dict[str, Any] = {}
+    _app_map: Dict[str, Any] = {}
+    # токен → индексы приложений в _apps
+    _token_index: Dict[str, set] = {}
+    _mtime_sig: Optional[Tuple] = None
+    # Номер сборки каталога; растёт при каждой пересборке
+    generation = 0
+
+    @staticmethod
+    def _application_dirs() -> List[str]:
+        """Каталоги XDG, в которых лежат .desktop файлы"""
+        data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+        return [
+            os.path.join(base, "applications")
+            for base in [data_home, *data_dirs.split(":")]
+            if base
+        ]
+
+    @classmethod
+    def _current_signature(cls) -> Tuple:
+        signature = []
+        for path in cls._application_dirs():
+            try:
+                signature.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                signature.append((path, None))
+        return tuple(signature)
+
+    @staticmethod
+    def _build_maps(apps: List[Any]) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, set]]:
+        """
+        Построить карту идентификаторов, карту по имени и индекс токенов
+        за один проход; каждое поле приводится к нижнему регистру один раз
+        """
+        identifiers: Dict[str, Any] = {}
+        app_map: Dict[str, Any] = {}
+        index: Dict[str, set] = {}
+        for position, app in enumerate(apps):
+            _annotate_app(app)
+            if app.name:
+                app_map[app.name] = app
+            keys = (
+                app._lc_name,
+                app._lc_display,
+                app._lc_window_class,
+                app._lc_exec_basename,
+                app._lc_cmd_basename,
+            )
+
+            for key in keys:
+                if not key:
+                    continue
+                identifiers[key] = app
+                for token in _TOKEN_SPLIT_RE.split(key):
+                    if token:
+                        index.setdefault(token, set()).add(position)
+        return identifiers, app_map, index
+
+    @classmethod
+    def match_tokens(cls, normalized_id: str) -> Optional[Any]:
+        """
+        Найти приложение, содержащее все токены запроса, через индекс
+
+        Из кандидатов берётся первое по порядку каталога, у которого запрос
+        действительно входит в одно из полей
+        """
+        candidates = None
+        for token in _TOKEN_SPLIT_RE.split(normalized_id):
+            if not token:
+                continue
+            positions = cls._token_index.get(token)
+            if not positions:
+                return None
+            candidates = positions if candidates is None else candidates & positions
+            if not candidates:
+                return None
+
+        if not candidates:
+            return None
+        for position in sorted(candidates):
+            app = cls._apps[position]
+            if _app_contains(app, normalized_id):
+                return app
+        return None
+
+    @classmethod
+    def get(cls) -> Tuple[List[Any], Dict[str, Any], Dict[str, Any]]:
+        """Получить (приложения, карта идентификаторов, карта по имени)"""
+        signature = cls._current_signature()
+        if signature != cls._mtime_sig:
+            cls._apps = get_desktop_applications()
+            cls._identifiers, cls._app_map, cls._token_index = cls._build_maps(cls._apps)
+            cls._mtime_sig = signature
+            cls.generation += 1
+        return cls._apps, cls._identifiers, cls._app_map
+
+
 class DockConfig:
     """Управление конфигурацией dock"""
 
     def __init__(self, config_path: str = DOCK_CONFIG_PATH):
         self.config_path = get_relative_path(config_path)
         self.config = self._read_config()
+        self._save_pending_id = 0
 
     def _read_config(self) -> Dict[str, Any]:
         """Прочитать конфигурацию из файла"""
@@ -117,8 +288,7 @@ class DockConfig:
 
     def _migrate_config(self, config_data: Dict) -> Dict:
         """Мигрировать конфигурацию из старого формата"""
-        all_apps = get_desktop_applications()
-        app_map = {app.name: app for app in all_apps if app.name}
+        _, _, app_map = _AppCatalog.get()
         old_pinned = config_data["pinned_apps"]
         config_data["pinned_apps"] = []
 
@@ -149,15 +319,24 @@ class DockConfig:
         self.config["pinned_apps"] = value
 
     def save(self) -> bool:
-        """Сохранить конфигурацию в файл"""
+        """Сохранить конфигурацию в файл (атомарно: запись во временный файл и rename)"""
         try:
-            with open(self.config_path, "w") as file:
-                json.dump(self.config, file, indent=4)
+            write_file_atomic(self.config_path, json.dumps(self.config, indent=4).encode())
             return True
         except Exception as e:
             logging.error(f"Failed to write dock config: {e}")
             return False
 
+    def schedule_save(self):
+        """Сохранить в простое главного цикла; несколько вызовов подряд дают одну запись"""
+        if not self._save_pending_id:
+            self._save_pending_id = GLib.idle_add(self._flush_save, priority=GLib.PRIORITY_LOW)
+
+    def _flush_save(self) -> bool:
+        self._save_pending_id = 0
+        self.save()
+        return GLib.SOURCE_REMOVE
+
     def reload(self):
         """Перезагрузить конфигурацию из файла"""
         self.config = self._read_config()
@@ -166,12 +345,9 @@ class DockConfig:
 def create_surface_from_widget(widget: Gtk.Widget) -> cairo.ImageSurface:
     """Создать Cairo surface из GTK виджета для drag-and-drop"""
     alloc = widget.get_allocation()
+    # ARGB32 surface создаётся уже прозрачным, отдельная заливка не нужна
     surface = cairo.ImageSurface(cairo.Format.ARGB32, alloc.width, alloc.height)
-    cr = cairo.Context(surface)
-    cr.set_source_rgba(255, 255, 255, 0)
-    cr.rectangle(0, 0, alloc.width, alloc.height)
-    cr.fill()
-    widget.draw(cr)
+    widget.draw(cairo.Context(surface))
     return surface
 
 
@@ -249,6 +425,17 @@ class Dock(Window):
         self.is_mouse_over_dock_area = False
         self._prevent_occlusion = False
         self._forced_occlusion = False
+        self._pending_update_id: Optional[int] = None
+        # Кнопки прошлого update_dock по ключу (раздел, идентификатор, номер)
+        self._button_pool: Dict[Tuple, Button] = {}
+        self._separator: Optional[Box] = None
+        # Сигнатура входных данных последнего update_dock
+        self._last_sig: Optional[Tuple] = None
+        # Триграммный индекс классов окон текущего update_dock
+        self._class_keys: List[str] = []
+        self._class_trigrams: Dict[str, set] = {}
+        # id(app_data) → (app_data, ((идентификатор, нормализованный), ...))
+        self._pinned_ident_cache: Dict[int, Tuple] = {}
 
     def _calculate_orientation(self) -> DockOrientation:
         """Вычислить ориентацию dock"""
@@ -269,12 +456,32 @@ class Dock(Window):
         self.conn = get_hyprland_connection()
         self.pinned = self.dock_config.pinned_apps
 
+    @property
+    def pinned(self) -> List:
+        """Закрепленные приложения"""
+        return self._pinned
+
+    @pinned.setter
+    def pinned(self, value: List):
+        self._pinned = value
+        self._pinned_ident_cache.clear()
+        # Ключ → индекс первого закрепленного с этим ключом
+        self._pinned_index: Dict[Tuple, int] = {}
+        for i, pinned_app in enumerate(value):
+            self._pinned_index.setdefault(self._pinned_key(pinned_app), i)
+
+    @staticmethod
+    def _pinned_key(app_id) -> Tuple:
+        """Ключ закрепленного приложения: словари сравниваются по name"""
+        if isinstance(app_id, dict):
+            return ("name", app_id.get("name"))
+        return ("id", app_id)
+
     def _init_icon_resolver(self):
         """Инициализировать разрешение иконок"""
         self.icon_resolver = IconResolver()
-        self._all_apps = get_desktop_applications()
-        self.app_identifiers = self._build_app_identifiers_map()
-        self.app_map = {app.name: app for app in self._all_apps if app.name}
+        self._all_apps, self.app_identifiers, self.app_map = _AppCatalog.get()
+        self._find_cache: Dict[str, Any] = {}
 
     def _init_drag_state(self):
         """Инициализировать состояние drag-and-drop"""
@@ -289,6 +496,7 @@ class Dock(Window):
         if data.BAR_POSITION == "Right":
             style_classes.append("left")
 
+        # wrapper всегда fabric Box: панель встраивает его и вешает на него классы темы
         self.wrapper = Box(name="dock", children=[self.view], style_classes=style_classes)
         self.wrapper.set_orientation(orientation.dock_wrapper_orientation)
 
@@ -309,8 +517,9 @@ class Dock(Window):
             "Dense": "dense",
             "Edge": "edge",
         }
-        theme_class = theme_classes.get(data.DOCK_THEME, "pills")
-        self.wrapper.add_style_class(theme_class)
+        # Текущий класс темы wrapper'а — панель заменяет его без перебора всех классов
+        self.theme_class = theme_classes.get(data.DOCK_THEME, "pills")
+        self.wrapper.add_style_class(self.theme_class)
 
     def _create_dock_full(self, orientation: DockOrientation):
         """Создать полный dock с углами"""
@@ -435,19 +644,17 @@ class Dock(Window):
 
     def _setup_drag_and_drop(self):
         """Настроить drag-and-drop"""
-        target_entry = Gtk.TargetEntry.new("text/plain", Gtk.TargetFlags.SAME_APP, 0)
-
         # Source
         self.view.drag_source_set(
             Gdk.ModifierType.BUTTON1_MASK,
-            [target_entry],
+            _DND_TARGETS,
             Gdk.DragAction.MOVE
         )
 
         # Destination
         self.view.drag_dest_set(
             Gtk.DestDefaults.ALL,
-            [target_entry],
+            _DND_TARGETS,
             Gdk.DragAction.MOVE
         )
 
@@ -475,57 +682,41 @@ class Dock(Window):
         if self.conn.ready:
             self.update_dock()
             if not self.integrated_mode:
-                GLib.timeout_add(OCCLUSION_CHECK_INTERVAL, self.check_occlusion_state)
+                self._register_occlusion_check()
         else:
             self.conn.connect("event::ready", self.update_dock)
             if not self.integrated_mode:
+                # Первая проверка через UPDATE_DOCK_DELAY, дальше — общий таймер
                 self.conn.connect(
                     "event::ready",
-                    lambda *args: GLib.timeout_add(UPDATE_DOCK_DELAY, self.check_occlusion_state)
+                    lambda *args: GLib.timeout_add(UPDATE_DOCK_DELAY, self._register_occlusion_check)
                 )
 
         # Подписаться на события окон
-        self.conn.connect("event::openwindow", self.update_dock)
-        self.conn.connect("event::closewindow", self.update_dock)
+        self.conn.connect("event::openwindow", self._schedule_update)
+        self.conn.connect("event::closewindow", self._schedule_update)
 
         if not self.integrated_mode:
             self.conn.connect("event::workspace", self.check_hide)
 
-        # Проверка изменений конфигурации
-        GLib.timeout_add_seconds(2, self.check_config_change)
+        # Перечитывать конфигурацию только при изменении файла
+        config_file = Gio.File.new_for_path(self.dock_config.config_path)
+        self._config_monitor = config_file.monitor_file(Gio.FileMonitorFlags.NONE, None)
+        self._config_monitor.connect("changed", self._on_config_file_changed)
 
-    # ==================== App Identifiers ====================
+    def _on_config_file_changed(self, monitor, file, other_file, event_type):
+        """Обработать изменение dock.json на диске"""
+        if event_type in (
+            Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+            Gio.FileMonitorEvent.CREATED,
+        ):
+            self.check_config_change()
 
-    def _build_app_identifiers_map(self) -> Dict[str, Any]:
-        """Построить карту идентификаторов приложений"""
-        identifiers = {}
-        for app in self._all_apps:
-            if app.name:
-                identifiers[app.name.lower()] = app
-            if app.display_name:
-                identifiers[app.display_name.lower()] = app
-            if app.window_class:
-                identifiers[app.window_class.lower()] = app
-            if app.executable:
-                identifiers[app.executable.split('/')[-1].lower()] = app
-            if app.command_line:
-                cmd_base = app.command_line.split()[0].split('/')[-1].lower()
-                identifiers[cmd_base] = app
-        return identifiers
+    # ==================== App Identifiers ====================
 
     def _normalize_window_class(self, class_name: str) -> str:
         """Нормализовать класс окна"""
-        if not class_name:
-            return ""
-
-        normalized = class_name.lower()
-        suffixes = [".bin", ".exe", ".so", "-bin", "-gtk"]
-
-        for suffix in suffixes:
-            if normalized.endswith(suffix):
-                normalized = normalized[:-len(suffix)]
-
-        return normalized
+        return _normalize_class_name(class_name)
 
     def _classes_match(self, class1: str, class2: str) -> bool:
         """Проверить совпадение классов окон"""
@@ -537,10 +728,12 @@ class Dock(Window):
         return norm1 == norm2
 
     def update_app_map(self):
-        """Обновить карту приложений"""
-        self._all_apps = get_desktop_applications()
-        self.app_map = {app.name: app for app in self._all_apps if app.name}
-        self.app_identifiers = self._build_app_identifiers_map()
+        """Обновить карту приложений (из общего кэша, если .desktop не менялись)"""
+        apps, self.app_identifiers, self.app_map = _AppCatalog.get()
+        if apps is not self._all_apps:
+            self._all_apps = apps
+            self._find_cache.clear()
+            self._pinned_ident_cache.clear()
 
     def find_app(self, app_identifier) -> Optional[Any]:
         """Найти приложение по идентификатору"""
@@ -564,21 +757,28 @@ class Dock(Window):
 
         normalized_id = str(key_value).lower()
 
+        cached = self._find_cache.get(normalized_id, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        app = self._lookup_app(normalized_id)
+        self._find_cache[normalized_id] = app
+        return app
+
+    def _lookup_app(self, normalized_id: str) -> Optional[Any]:
+        """Поиск приложения без кэша: точное совпадение, затем нечёткое"""
         # Exact match
         if normalized_id in self.app_identifiers:
             return self.app_identifiers[normalized_id]
 
-        # Fuzzy match
+        # Совпадение по целым токенам через индекс
+        app = _AppCatalog.match_tokens(normalized_id)
+        if app:
+            return app
+
+        # Fuzzy match: частичные совпадения внутри слов
         for app in self._all_apps:
-            if app.name and normalized_id in app.name.lower():
-                return app
-            if app.display_name and normalized_id in app.display_name.lower():
-                return app
-            if app.window_class and normalized_id in app.window_class.lower():
-                return app
-            if app.executable and normalized_id in app.executable.lower():
-                return app
-            if app.command_line and normalized_id in app.command_line.lower():
+            if _app_contains(app, normalized_id):
                 return app
 
         return None
@@ -601,7 +801,7 @@ class Dock(Window):
                 h_align="center",
                 children=[Image(pixbuf=icon_pixbuf)]
             ),
-            on_clicked=lambda *a: self.handle_app(app_identifier, instances, desktop_app),
+            on_clicked=lambda btn, *a: self.handle_app(btn.app_identifier, btn.instances, btn.desktop_app),
             tooltip_text=display_name,
             name="dock-app-button",
         )
@@ -621,7 +821,35 @@ class Dock(Window):
         return button
 
     def _get_app_icon(self, app_identifier, desktop_app) -> Any:
-        """Получить иконку приложения"""
+        """Получить иконку приложения (с кэшем по идентификатору и размеру)"""
+        id_value = app_identifier.get("name") if isinstance(app_identifier, dict) else app_identifier
+        key = (self._icon_cache_id(app_identifier, desktop_app), self.icon_size)
+
+        icon_pixbuf = _ICON_CACHE.get(key)
+        if icon_pixbuf is not None:
+            _ICON_CACHE.move_to_end(key)
+            return icon_pixbuf
+
+        icon_pixbuf = self._load_app_icon(id_value, desktop_app)
+        if icon_pixbuf is not None:
+            _ICON_CACHE[key] = icon_pixbuf
+            if len(_ICON_CACHE) > ICON_CACHE_SIZE:
+                _ICON_CACHE.popitem(last=False)
+        return icon_pixbuf
+
+    @staticmethod
+    def _icon_cache_id(app_identifier, desktop_app) -> Tuple:
+        """Стабильный ключ иконки: desktop app, имя закрепленного или repr самого pin"""
+        if desktop_app:
+            return ("app", desktop_app.name or desktop_app.executable or desktop_app.window_class)
+        if isinstance(app_identifier, dict):
+            if app_identifier.get("name"):
+                return ("name", app_identifier["name"])
+            return ("pin", repr(sorted(app_identifier.items())))
+        return ("name", app_identifier)
+
+    def _load_app_icon(self, id_value, desktop_app) -> Any:
+        """Загрузить иконку приложения"""
         # Попытка через desktop app
         if desktop_app:
             icon_pixbuf = desktop_app.get_icon_pixbuf(size=self.icon_size)
@@ -629,10 +857,10 @@ class Dock(Window):
                 return icon_pixbuf
 
         # Попытка через icon resolver
-        id_value = app_identifier["name"] if isinstance(app_identifier, dict) else app_identifier
-        icon_pixbuf = self.icon_resolver.get_icon_pixbuf(id_value, self.icon_size)
-        if icon_pixbuf:
-            return icon_pixbuf
+        if id_value:
+            icon_pixbuf = self.icon_resolver.get_icon_pixbuf(id_value, self.icon_size)
+            if icon_pixbuf:
+                return icon_pixbuf
 
         # Fallback иконки
         for fallback in ["application-x-executable-symbolic", "image-missing"]:
@@ -660,17 +888,15 @@ class Dock(Window):
 
     def _setup_button_drag(self, button: Button):
         """Настроить drag-and-drop для кнопки"""
-        target_entry = Gtk.TargetEntry.new("text/plain", Gtk.TargetFlags.SAME_APP, 0)
-
         button.drag_source_set(
             Gdk.ModifierType.BUTTON1_MASK,
-            [target_entry],
+            _DND_TARGETS,
             Gdk.DragAction.MOVE
         )
 
         button.drag_dest_set(
             Gtk.DestDefaults.ALL,
-            [target_entry],
+            _DND_TARGETS,
             Gdk.DragAction.MOVE
         )
 
@@ -728,10 +954,22 @@ class Dock(Window):
         focused = self.get_focused()
         idx = next((i for i, inst in enumerate(instances) if inst["address"] == focused), -1)
         next_inst = instances[(idx + 1) % len(instances)]
-        exec_shell_command(f"hyprctl dispatch focuswindow address:{next_inst['address']}")
+        self.conn.send_command(f"/dispatch focuswindow address:{next_inst['address']}")
 
     # ==================== Update Dock ====================
 
+    def _schedule_update(self, *args):
+        """Отложить update_dock, склеивая пачку событий в одно обновление"""
+        if self._pending_update_id is not None:
+            GLib.source_remove(self._pending_update_id)
+        self._pending_update_id = GLib.timeout_add(UPDATE_COALESCE_DELAY, self._do_update_dock)
+
+    def _do_update_dock(self) -> bool:
+        """Выполнить отложенное обновление dock"""
+        self._pending_update_id = None
+        self.update_dock()
+        return GLib.SOURCE_REMOVE
+
     def update_dock(self, *args):
         """Обновить dock"""
         self.update_app_map()
@@ -741,60 +979,135 @@ class Dock(Window):
             remove_handler(self._arranger_handler)
 
         clients = self.get_clients()
+
+        # Пересобирать кнопки, только если изменились окна, закрепленные
+        # приложения или каталог
+        sig = (
+            tuple(sorted((c.get("address", ""), c.get("class", "")) for c in clients)),
+            tuple(repr(p) for p in self.pinned),
+            _AppCatalog.generation,
+        )
+        if sig != self._last_sig:
+            self._last_sig = sig
+            self._rebuild_buttons(clients)
+            if not self.integrated_mode:
+                idle_add(self._update_size)
+
+        self._drag_in_progress = False
+
+        if not self.integrated_mode:
+            self.check_occlusion_state()
+
+    def _rebuild_buttons(self, clients: List):
+        """Привести кнопки dock к текущим окнам и закрепленным приложениям"""
         running_windows = self._build_running_windows(clients)
+        self._index_window_classes(running_windows)
+
+        # Кнопки прошлого обновления переиспользуются по ключу
+        pool = self._button_pool
+        self._button_pool = {}
 
         # Создать кнопки для закрепленных приложений
-        pinned_buttons, used_classes = self._create_pinned_buttons(running_windows)
+        pinned_buttons, used_classes = self._create_pinned_buttons(running_windows, pool)
 
         # Создать кнопки для открытых приложений
-        open_buttons = self._create_open_buttons(running_windows, used_classes)
+        open_buttons = self._create_open_buttons(running_windows, used_classes, pool)
 
         # Объединить с разделителем
         children = self._combine_buttons(pinned_buttons, open_buttons)
 
-        self.view.children = children
-
-        if not self.integrated_mode:
-            idle_add(self._update_size)
+        self._apply_children(children)
 
-        self._drag_in_progress = False
-
-        if not self.integrated_mode:
-            self.check_occlusion_state()
+        # Кнопки, которых больше нет в dock
+        for button in pool.values():
+            button.destroy()
 
     def _build_running_windows(self, clients: List) -> Dict[str, List]:
         """Построить словарь запущенных окон"""
-        running_windows = {}
+        running_windows = defaultdict(list)
 
         for c in clients:
             window_id = self._extract_window_id(c)
-            running_windows.setdefault(window_id, []).append(c)
+            running_windows[window_id].append(c)
 
             # Добавить нормализованную версию
             normalized_id = self._normalize_window_class(window_id)
             if normalized_id != window_id:
-                running_windows.setdefault(normalized_id, []).extend(running_windows[window_id])
+                running_windows[normalized_id].append(c)
 
-        return running_windows
+        return dict(running_windows)
 
     def _extract_window_id(self, client: Dict) -> str:
         """Извлечь идентификатор окна из данных клиента"""
-        # Попытка через class
-        if class_name := client.get("initialClass", "").lower():
-            return class_name
-        if class_name := client.get("class", "").lower():
-            return class_name
+        get = client.get
+
+        # Попытка через class; lower() только для непустого значения
+        if class_name := get("initialClass"):
+            return class_name.lower()
+        if class_name := get("class"):
+            return class_name.lower()
 
         # Попытка через title
-        if title := client.get("title", "").lower():
-            possible_name = title.split(" - ")[0].strip()
-            if possible_name and len(possible_name) > 1:
+        if title := get("title"):
+            title = title.lower()
+            possible_name = title.split(" - ", 1)[0].strip()
+            if len(possible_name) > 1:
                 return possible_name
             return title
 
         return "unknown-app"
 
-    def _create_pinned_buttons(self, running_windows: Dict) -> Tuple[List[Button], set]:
+    def _take_button(self, section: str, app_identifier, instances: List, pool: Dict) -> Button:
+        """Взять кнопку из пула прошлого обновления или создать новую"""
+        identity = json.dumps(app_identifier, sort_keys=True)
+        number = 0
+        while (section, identity, number) in self._button_pool:
+            number += 1
+        key = (section, identity, number)
+
+        button = pool.pop(key, None)
+        desktop_app = self.find_app(app_identifier)
+        if button is not None and button.desktop_app is desktop_app:
+            self._refresh_button(button, app_identifier, instances)
+        else:
+            if button is not None:
+                button.destroy()
+            button = self.create_button(app_identifier, instances)
+
+        self._button_pool[key] = button
+        return button
+
+    def _refresh_button(self, button: Button, app_identifier, instances: List):
+        """Обновить переиспользуемую кнопку под новые экземпляры"""
+        button.app_identifier = app_identifier
+        button.instances = instances
+
+        if instances:
+            button.add_style_class("instance")
+        else:
+            button.remove_style_class("instance")
+
+        display_name = self._get_display_name(app_identifier, button.desktop_app, instances)
+        if button.get_tooltip_text() != display_name:
+            button.set_tooltip_text(display_name)
+
+    def _apply_children(self, children: List):
+        """Привести дочерние виджеты view к списку children без пересоздания"""
+        current = self.view.get_children()
+        if current == children:
+            return
+
+        keep = set(children)
+        for child in current:
+            if child not in keep:
+                self.view.remove(child)
+
+        for position, child in enumerate(children):
+            if child.get_parent() is None:
+                self.view.add(child)
+            self.view.reorder_child(child, position)
+
+    def _create_pinned_buttons(self, running_windows: Dict, pool: Dict) -> Tuple[List[Button], set]:
         """Создать кнопки для закрепленных приложений"""
         pinned_buttons = []
         used_classes = set()
@@ -806,34 +1119,82 @@ class Dock(Window):
                 used_classes.add(matched_class)
                 used_classes.add(self._normalize_window_class(matched_class))
 
-            pinned_buttons.append(self.create_button(app_data, instances))
+            pinned_buttons.append(self._take_button("pinned", app_data, instances, pool))
 
         return pinned_buttons, used_classes
 
     def _find_instances_for_app(self, app_data, running_windows: Dict) -> Tuple[List, Optional[str]]:
         """Найти экземпляры для приложения"""
-        app = self.find_app(app_data)
-        possible_identifiers = self._get_possible_identifiers(app_data, app)
-
-        for identifier in possible_identifiers:
+        for identifier, normalized in self._get_identifier_pairs(app_data):
             # Exact match
-            if identifier in running_windows:
-                return running_windows[identifier], identifier
+            instances = running_windows.get(identifier)
+            if instances is not None:
+                return instances, identifier
 
             # Normalized match
-            normalized = self._normalize_window_class(identifier)
-            if normalized in running_windows:
-                return running_windows[normalized], normalized
+            instances = running_windows.get(normalized)
+            if instances is not None:
+                return instances, normalized
 
             # Fuzzy match
             if len(identifier) >= 3:
-                for window_class in running_windows:
-                    if identifier in window_class:
-                        return running_windows[window_class], window_class
+                window_class = self._find_class_containing(identifier)
+                if window_class is not None:
+                    return running_windows[window_class], window_class
 
         return [], None
 
-    def _get_possible_identifiers(self, app_data, app) -> List[str]:
+    def _index_window_classes(self, running_windows: Dict):
+        """Построить триграммный индекс ключей running_windows для нечёткого поиска"""
+        self._class_keys = list(running_windows)
+        trigrams: Dict[str, set] = {}
+        for position, window_class in enumerate(self._class_keys):
+            for i in range(len(window_class) - 2):
+                trigrams.setdefault(window_class[i:i + 3], set()).add(position)
+        self._class_trigrams = trigrams
+
+    def _find_class_containing(self, identifier: str) -> Optional[str]:
+        """
+        Первый (в порядке running_windows) класс окна, содержащий identifier
+
+        Кандидаты — классы со всеми триграммами identifier; подстрока
+        проверяется только для них
+        """
+        candidates = None
+        for i in range(len(identifier) - 2):
+            positions = self._class_trigrams.get(identifier[i:i + 3])
+            if not positions:
+                return None
+            candidates = positions if candidates is None else candidates & positions
+            if not candidates:
+                return None
+
+        for position in sorted(candidates):
+            window_class = self._class_keys[position]
+            if identifier in window_class:
+                return window_class
+        return None
+
+    def _get_identifier_pairs(self, app_data) -> Tuple[Tuple[str, str], ...]:
+        """Пары (идентификатор, нормализованный) для закрепленного приложения, с кэшем"""
+        cached = self._pinned_ident_cache.get(id(app_data))
+        # Ссылка на app_data в записи не даёт id переиспользоваться
+        if cached is not None and cached[0] is app_data:
+            return cached[1]
+
+        if isinstance(app_data, dict) and app_data.get("window_class"):
+            # Закреплённое после миграции: все поля уже в самом app_data
+            app = None
+        else:
+            app = self.find_app(app_data)
+        pairs = tuple(
+            (identifier, self._normalize_window_class(identifier))
+            for identifier in self._get_possible_identifiers(app_data, app)
+        )
+        self._pinned_ident_cache[id(app_data)] = (app_data, pairs)
+        return pairs
+
+    def _get_possible_identifiers(self, app_data, app) -> Tuple[str, ...]:
         """Получить возможные идентификаторы для приложения"""
         identifiers = []
 
@@ -842,34 +1203,38 @@ class Dock(Window):
             for key in ["window_class", "executable", "command_line", "name", "display_name"]:
                 if key in app_data and app_data[key]:
                     identifiers.append(app_data[key].lower())
+            # Базовые имена бинарника, как у desktop app
+            if app_data.get("executable"):
+                identifiers.append(app_data["executable"].split('/')[-1].lower())
+            cmd_parts = (app_data.get("command_line") or "").split()
+            if cmd_parts:
+                identifiers.append(cmd_parts[0].split('/')[-1].lower())
         elif isinstance(app_data, str):
             identifiers.append(app_data.lower())
 
-        # Из desktop app
+        # Из desktop app (поля уже в нижнем регистре, см. _annotate_app)
         if app:
-            if app.window_class:
-                identifiers.append(app.window_class.lower())
-            if app.executable:
-                identifiers.append(app.executable.split('/')[-1].lower())
-            if app.command_line:
-                cmd_parts = app.command_line.split()
-                if cmd_parts:
-                    identifiers.append(cmd_parts[0].split('/')[-1].lower())
-            if app.name:
-                identifiers.append(app.name.lower())
-            if app.display_name:
-                identifiers.append(app.display_name.lower())
-
-        return list(set(identifiers))
-
-    def _create_open_buttons(self, running_windows: Dict, used_classes: set) -> List[Button]:
+            for field in (
+                app._lc_window_class,
+                app._lc_exec_basename,
+                app._lc_cmd_basename,
+                app._lc_name,
+                app._lc_display,
+            ):
+                if field:
+                    identifiers.append(field)
+
+        # Без повторов, в порядке приоритета полей (list(set()) терял порядок)
+        return tuple(dict.fromkeys(identifiers))
+
+    def _create_open_buttons(self, running_windows: Dict, used_classes: set, pool: Dict) -> List[Button]:
         """Создать кнопки для открытых приложений"""
         open_buttons = []
 
         for class_name, instances in running_windows.items():
             if class_name not in used_classes:
                 identifier = self._create_app_identifier(class_name, instances)
-                open_buttons.append(self.create_button(identifier, instances))
+                open_buttons.append(self._take_button("open", identifier, instances, pool))
 
         return open_buttons
 
@@ -907,19 +1272,20 @@ class Dock(Window):
         children = pinned_buttons.copy()
 
         if pinned_buttons and open_buttons:
-            separator_orientation = (
-                Gtk.Orientation.VERTICAL if self.view.get_orientation() == Gtk.Orientation.HORIZONTAL
-                else Gtk.Orientation.HORIZONTAL
-            )
-            separator = Box(
-                orientation=separator_orientation,
-                v_expand=False,
-                h_expand=False,
-                h_align="center",
-                v_align="center",
-                name="dock-separator"
-            )
-            children.append(separator)
+            if self._separator is None:
+                separator_orientation = (
+                    Gtk.Orientation.VERTICAL if self.view.get_orientation() == Gtk.Orientation.HORIZONTAL
+                    else Gtk.Orientation.HORIZONTAL
+                )
+                self._separator = Box(
+                    orientation=separator_orientation,
+                    v_expand=False,
+                    h_expand=False,
+                    h_align="center",
+                    v_align="center",
+                    name="dock-separator"
+                )
+            children.append(self._separator)
 
         children.extend(open_buttons)
         return children
@@ -1044,7 +1410,18 @@ class Dock(Window):
     def on_drag_begin(self, widget, drag_context):
         """Обработать начало drag"""
         self._drag_in_progress = True
-        Gtk.drag_set_icon_surface(drag_context, create_surface_from_widget(widget))
+        Gtk.drag_set_icon_surface(drag_context, self._get_drag_surface(widget))
+
+    def _get_drag_surface(self, widget) -> cairo.ImageSurface:
+        """Surface иконки drag; перерисовывается только при смене размера или стиля"""
+        alloc = widget.get_allocation()
+        key = (alloc.width, alloc.height, widget.get_style_context().has_class("instance"))
+        surface = getattr(widget, "_drag_surface", None)
+        if surface is None or getattr(widget, "_drag_surface_key", None) != key:
+            surface = create_surface_from_widget(widget)
+            widget._drag_surface = surface
+            widget._drag_surface_key = key
+        return surface
 
     def on_drag_end(self, widget, drag_context):
         """Обработать окончание drag"""
@@ -1081,28 +1458,21 @@ class Dock(Window):
         app_index = self._find_pinned_app_index(app_id)
 
         if app_index >= 0:
-            self.pinned.pop(app_index)
-            self.dock_config.pinned_apps = self.pinned
-            self.dock_config.save()
+            pinned = list(self.pinned)
+            pinned.pop(app_index)
+            self.pinned = pinned
+            self.dock_config.pinned_apps = pinned
+            self.dock_config.schedule_save()
             self.update_dock()
         elif instances:
             # Фокусировать окно если есть экземпляры
             address = instances[0].get("address")
             if address:
-                exec_shell_command(f"hyprctl dispatch focuswindow address:{address}")
+                self.conn.send_command(f"/dispatch focuswindow address:{address}")
 
     def _find_pinned_app_index(self, app_id) -> int:
         """Найти индекс закрепленного приложения"""
-        for i, pinned_app in enumerate(self.pinned):
-            if self._app_ids_match(app_id, pinned_app):
-                return i
-        return -1
-
-    def _app_ids_match(self, app_id1, app_id2) -> bool:
-        """Проверить совпадают ли идентификаторы приложений"""
-        if isinstance(app_id1, dict) and isinstance(app_id2, dict):
-            return app_id1.get("name") == app_id2.get("name")
-        return app_id1 == app_id2
+        return self._pinned_index.get(self._pinned_key(app_id), -1)
 
     def _find_drag_target(self, widget) -> Optional[Any]:
         """Найти целевой виджет для drag"""
@@ -1205,9 +1575,9 @@ class Dock(Window):
         self.dock_config.pinned_apps = pinned_data
         self.pinned = pinned_data
 
-        file_updated = self.dock_config.save()
+        self.dock_config.schedule_save()
 
-        if file_updated and not skip_update:
+        if not skip_update:
             self.update_dock()
 
     # ==================== Occlusion and Visibility ====================
@@ -1326,6 +1696,7 @@ class Dock(Window):
     def check_config_change(self) -> bool:
         """Проверить изменения в конфигурации"""
         self.dock_config.reload()
+        self._last_sig = None
 
         if not self.integrated_mode:
             new_always_show = data.DOCK_ALWAYS_SHOW
@@ -1343,6 +1714,7 @@ class Dock(Window):
     def check_config_change_immediate(self) -> bool:
         """Немедленно проверить изменения конфигурации"""
         self.dock_config.reload()
+        self._last_sig = None
 
         if not self.integrated_mode:
             previous_always_show = self.always_show
@@ -1359,6 +1731,21 @@ class Dock(Window):
 
     # ==================== Static Methods ====================
 
+    _occlusion_timer_id: Optional[int] = None
+
+    def _register_occlusion_check(self) -> bool:
+        """Подключить dock к общему таймеру проверки окклюзии"""
+        self._occlusion_active = True
+        Dock._ensure_occlusion_timer()
+        self.check_occlusion_state()
+        return GLib.SOURCE_REMOVE
+
+    @classmethod
+    def _ensure_occlusion_timer(cls):
+        """Один таймер окклюзии на все dock вместо таймера на каждый монитор"""
+        if cls._occlusion_timer_id is None:
+            cls._occlusion_timer_id = GLib.timeout_add(OCCLUSION_CHECK_INTERVAL, _occlusion_tick)
+
     @staticmethod
     def notify_config_change():
         """Уведомить все экземпляры об изменении конфигурации"""
@@ -1375,3 +1762,11 @@ class Dock(Window):
             else:
                 if hasattr(dock, 'dock_revealer') and dock.dock_revealer.get_reveal_child():
                     dock.dock_revealer.set_reveal_child(False)
+
+
+def _occlusion_tick() -> bool:
+    """Проверить окклюзию всех подключённых dock"""
+    for dock in list(Dock._instances):
+        if getattr(dock, "_occlusion_active", False):
+            dock.check_occlusion_state()
+    return GLib.SOURCE_CONTINUE
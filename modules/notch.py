@@ -17,7 +17,7 @@ from loguru import logger
 import config.data as data
 from modules.cliphist import ClipHistory
 from modules.corners import MyCorner
-from modules.dashboard import Dashboard
+from modules.dashboard import LAZY_SECTIONS, Dashboard
 from modules.emoji import EmojiPicker
 from modules.launcher import AppLauncher
 from modules.overview import Overview
@@ -1084,20 +1084,12 @@ class Notch(Window):
 
     def _handle_dashboard_section(self, widget_name: str, is_dashboard_visible: bool) -> bool:
         """Обработать секции dashboard (ИСПРАВЛЕНО)"""
-        dashboard_sections = {
-            "pins": self.dashboard.pins,
-            "kanban": self.dashboard.kanban,
-            "wallpapers": self.dashboard.wallpapers,
-            "mixer": self.dashboard.mixer,
-        }
-
-        if widget_name not in dashboard_sections:
+        # Сравнение по имени: разделы создаются лениво и не трогаются до показа
+        if widget_name not in LAZY_SECTIONS:
             return False
 
-        section_widget = dashboard_sections[widget_name]
-
         # Если уже открыт этот раздел, закрыть
-        if is_dashboard_visible and self.dashboard.stack.get_visible_child() == section_widget:
+        if is_dashboard_visible and self.dashboard.get_visible_section_name() == widget_name:
             self.close_notch()
             return True
 
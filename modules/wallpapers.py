@@ -24,11 +24,6 @@ class WallpaperSelector(Box):
     CACHE_DIR = f"{data.CACHE_DIR}/thumbs"  # Changed from wallpapers to thumbs
 
     def __init__(self, **kwargs):
-        # Delete the old cache directory if it exists
-        old_cache_dir = f"{data.CACHE_DIR}/wallpapers"
-        if os.path.exists(old_cache_dir):
-            shutil.rmtree(old_cache_dir)
-
         super().__init__(
             name="wallpapers",
             spacing=4,
@@ -40,10 +35,12 @@ class WallpaperSelector(Box):
         os.makedirs(self.CACHE_DIR, exist_ok=True)
 
         self.files = []
-        GLib.idle_add(self._load_wallpapers_async().__next__)
         self.thumbnails = []
         self.thumbnail_queue = []
         self.executor = ThreadPoolExecutor(max_workers=4)  # Shared executor
+        self._loaded = False  # background scan started
+        self._scanned = False  # background scan finished
+        self._queued_random = None  # external flag of a random pick waiting for the scan
 
         # Variable to control the selection (similar to AppLauncher)
         self.selected_index = -1
@@ -198,7 +195,8 @@ class WallpaperSelector(Box):
 
         # Removed the old main_content_box and its add
 
-        self._start_thumbnail_thread()
+        # Directory scan and thumbnails run off the main thread, after the UI is up
+        GLib.idle_add(self.ensure_loaded, priority=GLib.PRIORITY_LOW)
         self.connect("map", self.on_map)
         self.setup_file_monitor()
         self.show_all()
@@ -206,54 +204,54 @@ class WallpaperSelector(Box):
         # Ensure the search entry gets focus when starting
         self.search_entry.grab_focus()
 
-    def _load_wallpapers_async(self):
-        """Non-blocking wallpaper processing."""
-
-        # Process old wallpapers: use os.scandir for efficiency and only loop
-        # over image files that actually need renaming (they're not already lowercase
-        # and with hyphens instead of spaces)
-        with os.scandir(data.WALLPAPERS_DIR) as entries:
-            for entry in entries:
-                if entry.is_file() and self._is_image(entry.name):
-                    # Check if the file needs renaming: file should be lowercase and have hyphens instead of spaces
-                    if entry.name != entry.name.lower() or " " in entry.name:
-                        new_name = entry.name.lower().replace(" ", "-")
-                        full_path = os.path.join(data.WALLPAPERS_DIR, entry.name)
+    def ensure_loaded(self):
+        """Start the background wallpaper scan once. Safe to use as an idle callback."""
+        if not self._loaded:
+            self._loaded = True
+            self.executor.submit(self._scan_wallpapers)
+        return False
+
+    def _scan_wallpapers(self):
+        """Worker: clean up legacy cache, normalize names and list images."""
+        # Delete the old cache directory if it exists
+        old_cache_dir = f"{data.CACHE_DIR}/wallpapers"
+        if os.path.exists(old_cache_dir):
+            shutil.rmtree(old_cache_dir, ignore_errors=True)
+
+        files = []
+        try:
+            with os.scandir(data.WALLPAPERS_DIR) as entries:
+                for entry in entries:
+                    if not (entry.is_file() and self._is_image(entry.name)):
+                        continue
+                    name = entry.name
+                    # Old wallpapers: file should be lowercase and have hyphens instead of spaces
+                    if name != name.lower() or " " in name:
+                        new_name = name.lower().replace(" ", "-")
+                        full_path = os.path.join(data.WALLPAPERS_DIR, name)
                         new_full_path = os.path.join(data.WALLPAPERS_DIR, new_name)
                         try:
                             os.rename(full_path, new_full_path)
-                            print(
-                                f"Renamed old wallpaper '{full_path}' to '{new_full_path}'"
-                            )
+                            print(f"Renamed old wallpaper '{full_path}' to '{new_full_path}'")
+                            name = new_name
                         except Exception as e:
                             print(f"Error renaming file {full_path}: {e}")
-                        yield
-
-        # Process files in small batches to keep UI responsive
-        file_list = os.listdir(data.WALLPAPERS_DIR)
-        batch_size = 20
+                    files.append(name)
+        except OSError as e:
+            # Still report back, so a queued random pick is not stranded
+            print(f"Error scanning wallpapers directory: {e}")
 
-        # Process files in batches
-        for i in range(0, len(file_list), batch_size):
-            batch = file_list[i : i + batch_size]
-            for filename in batch:
-                if self._is_image(filename):
-                    self.files.append(filename)
+        GLib.idle_add(self._on_wallpapers_scanned, files)
 
-            # Sort the current batch to maintain order
-            self.files.sort()
-
-            # Yield to let the main loop process events
-            yield True
-
-        # Final sort of the complete list
-        self.files.sort()
-
-        # Start thumbnail loading after files are processed
+    def _on_wallpapers_scanned(self, files):
+        # Keep anything the file monitor picked up while the scan was running
+        self.files = sorted(set(files).union(self.files))
+        self._scanned = True
         self._start_thumbnail_thread()
-
-        # Return False to stop the idle callback
-        yield False
+        if self._queued_random is not None:
+            external, self._queued_random = self._queued_random, None
+            self.set_random_wallpaper(None, external=external)
+        return False
 
     def randomize_dice_icon(self):
         dice_icons = [
@@ -270,6 +268,12 @@ class WallpaperSelector(Box):
             label.set_markup(chosen_icon)
 
     def set_random_wallpaper(self, widget, external=False):
+        if not self._scanned:
+            # Called before the background scan finished (e.g. from a keybind right
+            # after startup): pick once the worker has listed and renamed the files
+            self._queued_random = external
+            self.ensure_loaded()
+            return
         if not self.files:
             print("No wallpapers available to set a random one.")
             return
@@ -548,19 +552,22 @@ class WallpaperSelector(Box):
             except Exception as e:
                 print(f"Error processing {file_name}: {e}")
                 return
-        self.thumbnail_queue.append((cache_path, file_name))
+        # Decode in the worker too; the main thread only appends to the model
+        try:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file(cache_path)
+        except Exception as e:
+            print(f"Error loading thumbnail {cache_path}: {e}")
+            return
+        self.thumbnail_queue.append((pixbuf, file_name))
         GLib.idle_add(self._process_batch)
 
     def _process_batch(self):
         batch = self.thumbnail_queue[:10]
         del self.thumbnail_queue[:10]
-        for cache_path, file_name in batch:
-            try:
-                pixbuf = GdkPixbuf.Pixbuf.new_from_file(cache_path)
-                self.thumbnails.append((pixbuf, file_name))
-                self.viewport.get_model().append([pixbuf, file_name])
-            except Exception as e:
-                print(f"Error loading thumbnail {cache_path}: {e}")
+        model = self.viewport.get_model()
+        for pixbuf, file_name in batch:
+            self.thumbnails.append((pixbuf, file_name))
+            model.append([pixbuf, file_name])
         if self.thumbnail_queue:
             GLib.idle_add(self._process_batch)
         return False
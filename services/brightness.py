@@ -433,6 +433,11 @@ class Brightness(Service):
             return brightness
         return -1
 
+    def get_cached_brightness(self) -> int:
+        """Последняя известная яркость основного бэкенда без обращения к устройству."""
+        backend = self.backends.get(self.primary_backend) if self.primary_backend else None
+        return backend.current_brightness if backend is not None else -1
+
     def set_brightness(self, percent: int, backend_name: Optional[str] = None) -> bool:
         backend = backend_name or self.primary_backend
         if backend and backend in self.backends:
@@ -1,7 +1,9 @@
 import datetime
 import os
 import shutil
+import stat
 import subprocess
+import tempfile
 from typing import Dict, List, Literal
 
 import gi
@@ -225,6 +227,30 @@ def ensure_dir_exists(path: str):
         os.makedirs(path)
 
 
+# Function to write a file atomically (temp file + fsync + rename)
+def write_file_atomic(path: str, payload: bytes, mode: int = 0o644):
+    # An existing file keeps its permissions; mkstemp would leave 0600
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        pass
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
 # Function to unique list
 def unique_list(lst) -> List:
     return list(set(lst))
@@ -0,0 +1,91 @@
+"""
+Общий планировщик отложенных вызовов.
+
+Все подписчики обслуживаются одним GLib.timeout_add, взведённым на
+ближайший дедлайн, вместо отдельного таймера на каждый виджет.
+"""
+
+import heapq
+import itertools
+from typing import Callable, Hashable, Optional
+
+from gi.repository import GLib
+from loguru import logger
+
+# (deadline_us, seq, key); устаревшие записи отбрасываются при извлечении
+_heap: list[tuple[int, int, Hashable]] = []
+# Актуальный дедлайн и callback для каждого ключа
+_pending: dict[Hashable, tuple[int, Callable[[], None]]] = {}
+_counter = itertools.count()
+
+_source_id: Optional[int] = None
+_armed_deadline: Optional[int] = None
+
+
+def schedule(key: Hashable, deadline_us: int, callback: Callable[[], None]) -> None:
+    """
+    Вызвать callback в момент deadline_us (GLib.get_monotonic_time()).
+    Повторный вызов с тем же key переносит дедлайн.
+    """
+    _pending[key] = (deadline_us, callback)
+    heapq.heappush(_heap, (deadline_us, next(_counter), key))
+    _rearm()
+
+
+def cancel(key: Hashable) -> None:
+    """Отменить отложенный вызов для key"""
+    if _pending.pop(key, None) is not None:
+        _rearm()
+
+
+def _is_stale(entry: tuple[int, int, Hashable]) -> bool:
+    deadline, _, key = entry
+    current = _pending.get(key)
+    return current is None or current[0] != deadline
+
+
+def _rearm() -> None:
+    """Взвести общий таймер на ближайший актуальный дедлайн"""
+    global _source_id, _armed_deadline
+
+    while _heap and _is_stale(_heap[0]):
+        heapq.heappop(_heap)
+
+    if not _heap:
+        if _source_id is not None:
+            GLib.source_remove(_source_id)
+            _source_id = None
+            _armed_deadline = None
+        return
+
+    deadline = _heap[0][0]
+    if _source_id is not None and _armed_deadline <= deadline:
+        # Уже взведён не позже нужного; ранний запуск просто перевзведёт таймер
+        return
+    if _source_id is not None:
+        GLib.source_remove(_source_id)
+
+    delay_ms = max(0, (deadline - GLib.get_monotonic_time() + 999) // 1000)
+    _source_id = GLib.timeout_add(delay_ms, _dispatch)
+    _armed_deadline = deadline
+
+
+def _dispatch() -> bool:
+    """Выполнить все наступившие вызовы и перевзвести таймер"""
+    global _source_id, _armed_deadline
+    _source_id = None
+    _armed_deadline = None
+
+    now = GLib.get_monotonic_time()
+    while _heap and _heap[0][0] <= now:
+        entry = heapq.heappop(_heap)
+        if _is_stale(entry):
+            continue
+        _, callback = _pending.pop(entry[2])
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Tick callback failed: {e}")
+
+    _rearm()
+    return False